@@ -1,5 +1,5 @@
 use serde::{Deserialize, Serialize};
-use std::process::Command;
+use tokio::process::Command;
 
 #[derive(Debug, Serialize, Deserialize)]
 pub struct GeminiStatusResponse {
@@ -109,7 +109,8 @@ async fn call_python_backend<T: Serialize, R: for<'de> Deserialize<'de>>(
         .ok_or("Failed to get parent directory")?
         .join("backend");
 
-    // Call Python script
+    // Call Python script (tokio's Command waits on the child without
+    // blocking a runtime worker thread)
     let output = Command::new("python3")
         .current_dir(&backend_path)
         .arg("-m")
@@ -117,6 +118,7 @@ async fn call_python_backend<T: Serialize, R: for<'de> Deserialize<'de>>(
         .arg(operation)
         .arg(&json_input)
         .output()
+        .await
         .map_err(|e| format!("Failed to execute Python: {}", e))?;
 
     if !output.status.success() {
@@ -124,8 +126,8 @@ async fn call_python_backend<T: Serialize, R: for<'de> Deserialize<'de>>(
         return Err(format!("Python backend error: {}", stderr));
     }
 
-    // Parse response
-    let stdout = String::from_utf8_lossy(&output.stdout);
-    serde_json::from_str(&stdout)
+    // Parse response straight from the stdout bytes; the payload carries a
+    // multi-megabyte base64 image, so avoid a lossy UTF-8 copy first
+    serde_json::from_slice(&output.stdout)
         .map_err(|e| format!("Failed to parse response: {}", e))
 }
@@ -42,6 +42,9 @@ export default function ImageProcessDialog({ open, onClose, imageDataUrl, onAddT
   const [padding, setPadding] = useState(10);
   const [showAdvanced, setShowAdvanced] = useState(false);
   const [isSaving, setIsSaving] = useState(false);
+  // After "Try Again", fetch a fresh result instead of the cached one for
+  // the next request only
+  const [bypassCache, setBypassCache] = useState(false);
   const dialogRef = useRef<HTMLDivElement>(null);
   const { addImage } = useImageGalleryStore();
 
@@ -77,14 +80,16 @@ export default function ImageProcessDialog({ open, onClose, imageDataUrl, onAddT
         padding,
       });
 
-      // Step 2: Convert to line art using Gemini
-      const base64 = preprocessedDataUrl.split(',')[1];
+      // Step 2: Convert to line art using Gemini (the client strips the
+      // data URL prefix itself and keeps its MIME type)
       const result = await processImageForPlotter(
-        base64,
+        preprocessedDataUrl,
         useCustomPrompt ? undefined : style,
-        useCustomPrompt ? customPrompt : undefined
+        useCustomPrompt ? customPrompt : undefined,
+        { bypassCache }
       );
-      const processedDataUrl = `data:image/png;base64,${result.image_base64}`;
+      setBypassCache(false);
+      const processedDataUrl = `data:${result.mime_type};base64,${result.image_base64}`;
       setProcessedImage(processedDataUrl);
     } catch (err: unknown) {
       const message = err instanceof Error ? err.message : 'Failed to process image';
@@ -102,6 +107,7 @@ export default function ImageProcessDialog({ open, onClose, imageDataUrl, onAddT
   };
 
   const handleReset = () => {
+    setBypassCache(true);
     setProcessedImage(null);
     setError(null);
   };
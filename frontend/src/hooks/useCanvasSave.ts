@@ -8,6 +8,34 @@ import { Canvas } from 'fabric';
 import { useCanvasStore } from '../stores/canvasStore';
 import type { CanvasSide } from '../types';
 
+// Include ALL properties in serialization (including custom pattern properties)
+const SERIALIZED_PROPERTIES = [
+  'name',
+  'selectable',
+  'evented',
+  'excludeFromExport',
+  'fillPatternType',
+  'fillPatternSpacing',
+  'fillPatternBorderMargin',
+  'fillPatternStroke',
+  'fillPatternStrokeWidth',
+];
+
+/**
+ * Serialize the canvas for saving. Per-object diagnostics are only
+ * logged in development builds, since walking and formatting every object
+ * dominated save time on large canvases.
+ */
+function serializeCanvas(canvas: Canvas, logPrefix: string): Record<string, unknown> {
+  const json = (canvas as any).toJSON(SERIALIZED_PROPERTIES);
+
+  if (import.meta.env.DEV) {
+    console.debug(`${logPrefix}Canvas objects serialized:`, canvas.getObjects().length, json.objects?.length);
+  }
+
+  return json as Record<string, unknown>;
+}
+
 export function useCanvasSave(
   canvas: Canvas | null,
   projectId: string | undefined,
@@ -18,33 +46,9 @@ export function useCanvasSave(
   const handleSave = useCallback(async () => {
     if (!canvas || !projectId) return;
 
-    // Debug: Log all canvas objects before serialization
-    const objects = canvas.getObjects();
-    console.log('Canvas objects before toJSON:', objects.length, objects.map((o: any) => ({
-      type: o.type,
-      name: o.name,
-      selectable: o.selectable,
-      evented: o.evented,
-      excludeFromExport: o.excludeFromExport
-    })));
-
-    // Include ALL properties in serialization (including custom pattern properties)
-    const json = (canvas as any).toJSON([
-      'name',
-      'selectable',
-      'evented',
-      'excludeFromExport',
-      'fillPatternType',
-      'fillPatternSpacing',
-      'fillPatternBorderMargin',
-      'fillPatternStroke',
-      'fillPatternStrokeWidth'
-    ]);
-
-    console.log('Canvas JSON objects after toJSON:', json.objects?.length);
-    console.log('Canvas JSON full:', JSON.stringify(json, null, 2));
+    const json = serializeCanvas(canvas, '');
 
-    await saveCanvas(projectId, json as Record<string, unknown>, currentSide);
+    await saveCanvas(projectId, json, currentSide);
   }, [canvas, projectId, currentSide, saveCanvas]);
 
   // Auto-save when canvas becomes dirty
@@ -53,33 +57,9 @@ export function useCanvasSave(
 
     // Debounce auto-save by 2000ms to give user time to finish their edits
     const timeoutId = setTimeout(async () => {
-      // Debug: Log all canvas objects before serialization (auto-save)
-      const objects = canvas.getObjects();
-      console.log('[AUTO-SAVE] Canvas objects before toJSON:', objects.length, objects.map((o: any) => ({
-        type: o.type,
-        name: o.name,
-        selectable: o.selectable,
-        evented: o.evented,
-        excludeFromExport: o.excludeFromExport
-      })));
-
-      // Include ALL properties in serialization (including custom pattern properties)
-      const json = (canvas as any).toJSON([
-        'name',
-        'selectable',
-        'evented',
-        'excludeFromExport',
-        'fillPatternType',
-        'fillPatternSpacing',
-        'fillPatternBorderMargin',
-        'fillPatternStroke',
-        'fillPatternStrokeWidth'
-      ]);
-
-      console.log('[AUTO-SAVE] Canvas JSON objects after toJSON:', json.objects?.length);
-      console.log('[AUTO-SAVE] Full JSON structure:', JSON.stringify(json, null, 2));
+      const json = serializeCanvas(canvas, '[AUTO-SAVE] ');
 
-      await saveCanvas(projectId, json as Record<string, unknown>, currentSide);
+      await saveCanvas(projectId, json, currentSide);
     }, 2000);
 
     return () => clearTimeout(timeoutId);
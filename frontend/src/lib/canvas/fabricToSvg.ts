@@ -3,7 +3,7 @@
  * This replaces the backend API call for SVG export
  */
 
-import { Canvas } from 'fabric';
+import { StaticCanvas } from 'fabric';
 
 export interface SvgExportResult {
   svg: string;
@@ -39,10 +39,14 @@ export async function fabricCanvasToSvg(
     canvasElement.width = widthPx;
     canvasElement.height = heightPx;
 
-    // Create a temporary canvas to load the JSON with pixel dimensions
-    const tempCanvas = new Canvas(canvasElement, {
+    // Create a temporary canvas to load the JSON with pixel dimensions.
+    // A StaticCanvas skips the interactive layer (upper canvas, event
+    // listeners) that an export never uses, and rendering on every added
+    // object is disabled since only toSVG() is called.
+    const tempCanvas = new StaticCanvas(canvasElement, {
       width: widthPx,
       height: heightPx,
+      renderOnAddRemove: false,
     });
 
     // Load the canvas JSON
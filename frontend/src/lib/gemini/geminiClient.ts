@@ -3,23 +3,215 @@
  * Works in both web browser and Tauri desktop app
  */
 
-import { GoogleGenAI } from '@google/genai';
+import type { GoogleGenAI, GenerateContentResponse } from '@google/genai';
+import { parseDataUrl } from '../../utils/imageUtils';
+import { sha256Hex } from '../../utils/hash';
+
+const GEMINI_IMAGE_MODEL = 'gemini-3-pro-image-preview';
+
+// Responses carry multi-megabyte images, so keep only a handful
+const RESPONSE_CACHE_MAX_ENTRIES = 16;
+
+// Cached responses older than this are treated as misses
+const RESPONSE_CACHE_TTL_MS = 30 * 60 * 1000;
+
+// Largest base64 image accepted for processing (~20 MB decoded), matching
+// Gemini's inline request size limit
+const MAX_IMAGE_BASE64_LENGTH = 4 * Math.ceil((20 * 1024 * 1024) / 3);
+
+// Data URL MIME types sent to Gemini as-is (or normalised); anything else
+// is labelled image/png
+const GEMINI_INPUT_MIME_TYPES: Record<string, string> = {
+  'image/png': 'image/png',
+  'image/jpeg': 'image/jpeg',
+  'image/jpg': 'image/jpeg',
+  'image/webp': 'image/webp',
+};
+
+// Style-specific prompt instructions, keyed by style id
+const STYLE_PROMPTS: Record<string, string> = {
+  // Classic styles
+  line_art: 'Create as clean line art with bold outlines, suitable for pen plotting.',
+  sketch: 'Create as a sketch with varied line weights, suitable for pen plotting.',
+  minimal: 'Create as minimal line drawing with simple shapes, suitable for pen plotting.',
+  detailed: 'Create as detailed line illustration with cross-hatching for shading, suitable for pen plotting.',
+  // Advanced styles
+  continuous: 'Create as a CONTINUOUS SINGLE-LINE drawing where the pen NEVER lifts from the paper. The entire image must be ONE unbroken line that weaves and loops to form all shapes and shading. Like a TSP (traveling salesman) art piece - one continuous path that traces the entire drawing.',
+  geometric: 'Recreate the image using ONLY geometric shapes - triangles, circles, squares, hexagons, and polygons. Create a low-poly or mosaic effect where the subject is built entirely from flat geometric primitives with clean edges.',
+  spiral: 'Create as a SINGLE SPIRAL drawing starting from the center and spiraling outward. Vary the line thickness or waviness to represent light and dark areas. The result should look like a vinyl record or fingerprint pattern that reveals the image.',
+  stippling: 'Create using ONLY DOTS (stippling/pointillism technique). No continuous lines - represent all shading and form through varying density of small dots. Darker areas have more densely packed dots, lighter areas have sparse dots.',
+  hatching: 'Create using ONLY PARALLEL HATCHING LINES like an engraving or etching. Use different line angles and densities to create form and shading. Think of classic currency engraving or woodcut print style.',
+  contour: 'Create as TOPOGRAPHIC CONTOUR LINES, like an elevation map. Draw concentric lines that follow the "elevation" of brightness in the image. Results should look like terrain contour maps or fingerprints.',
+  ascii: 'Create as ASCII TEXT ART where the image is represented by text characters arranged in a grid. Use denser characters (@ # M W) for dark areas and lighter characters (. : -) for light areas. The result should be readable as monospace text art.',
+  cubist: 'Create in CUBIST style like Picasso - fragment the subject into geometric angular planes, show multiple perspectives simultaneously, use bold intersecting lines. Abstract but recognizable, with fragmented overlapping forms.',
+  wireframe: 'Create as a 3D WIREFRAME model - imagine the subject as a mesh of connected vertices. Draw grid-like lines over the 3D form surface, like retro computer graphics or CAD model visualization.',
+  circuit: 'Create as a CIRCUIT BOARD design - use only straight lines with 90-degree angles, add connection points as small circles at intersections. Make it look like an electronic PCB schematic that forms the image.',
+};
+
+// Plotter requirements appended to every text-to-image prompt
+const GENERATE_PROMPT_REQUIREMENTS = `
+
+IMPORTANT: This image will be used by a physical pen plotter machine.
+- Use ONLY black line outlines on a COMPLETELY WHITE background
+- Create vector-style line drawings, NOT raster images or photographs
+- No gradients, no shading with fills, no solid black areas
+- All shading must be done with line techniques (hatching, cross-hatching, stippling)
+- Make lines clear, distinct, and continuous so a pen can physically draw them
+- Think of it as a drawing made by a single pen on white paper
+- Use moderate detail that preserves recognizability while being plotter-friendly`;
+
+// Plotter requirements appended to every image conversion prompt
+const PROCESS_PROMPT_REQUIREMENTS = `
+
+IMPORTANT: Generate a NEW image with these specifications:
+- ONLY black lines on a COMPLETELY WHITE background
+- Vector-style line drawing, NOT a raster image
+- No gradients, no fills, no solid black areas
+- All shading must use line techniques (hatching, cross-hatching, stippling)
+- Clear, continuous lines that a physical pen can draw
+- Preserve the main subject and key features
+- Suitable for a pen plotter machine to physically draw`;
 
 export interface GeminiStatusResponse {
   configured: boolean;
   message: string;
 }
 
+export interface GeminiRequestOptions {
+  /** Skip the response cache and always call the API (e.g. "Try Again") */
+  bypassCache?: boolean;
+}
+
 export interface GeminiGenerateResponse {
   image_base64: string;
+  /** MIME type reported by Gemini for image_base64 (usually image/png) */
+  mime_type: string;
   prompt_used: string;
 }
 
+// Client reused across requests, rebuilt only when the API key changes
+let cachedClient: { apiKey: string; ai: GoogleGenAI } | null = null;
+
+/**
+ * Get a GoogleGenAI client for the given API key.
+ * The SDK is loaded on first use so it stays out of the initial bundle.
+ */
+async function getClient(apiKey: string): Promise<GoogleGenAI> {
+  if (!cachedClient || cachedClient.apiKey !== apiKey) {
+    const { GoogleGenAI } = await import('@google/genai');
+    cachedClient = { apiKey, ai: new GoogleGenAI({ apiKey }) };
+  }
+  return cachedClient.ai;
+}
+
+// In-memory LRU of recent responses keyed by a hash of the request.
+// Map preserves insertion order, so the first key is the least recently used.
+const responseCache = new Map<string, { response: GeminiGenerateResponse; cachedAt: number }>();
+
+/**
+ * Build a cache key from every input that affects the generated image
+ */
+async function getCacheKey(operation: string, ...parts: (string | undefined)[]): Promise<string> {
+  const material = [GEMINI_IMAGE_MODEL, operation, ...parts.map((p) => p ?? '')].join('\u0000');
+  return sha256Hex(new TextEncoder().encode(material));
+}
+
+function getCachedResponse(key: string): GeminiGenerateResponse | undefined {
+  const cached = responseCache.get(key);
+  if (!cached) {
+    return undefined;
+  }
+
+  responseCache.delete(key);
+  if (Date.now() - cached.cachedAt > RESPONSE_CACHE_TTL_MS) {
+    return undefined;
+  }
+
+  // Move to the most recently used position
+  responseCache.set(key, cached);
+  return cached.response;
+}
+
+function setCachedResponse(key: string, response: GeminiGenerateResponse): void {
+  responseCache.delete(key);
+  responseCache.set(key, { response, cachedAt: Date.now() });
+  if (responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+    const oldestKey = responseCache.keys().next().value;
+    if (oldestKey !== undefined) {
+      responseCache.delete(oldestKey);
+    }
+  }
+}
+
+// Requests currently awaiting Gemini, keyed like the response cache, so
+// identical concurrent calls (e.g. a double click) share one API request
+const inFlightRequests = new Map<string, Promise<GeminiGenerateResponse>>();
+
+/**
+ * Serve a request from the response cache, join an identical in-flight
+ * request, or run it and cache the result
+ */
+function runCachedRequest(
+  key: string,
+  options: GeminiRequestOptions,
+  request: () => Promise<GeminiGenerateResponse>
+): Promise<GeminiGenerateResponse> {
+  if (!options.bypassCache) {
+    const cached = getCachedResponse(key);
+    if (cached) {
+      return Promise.resolve(cached);
+    }
+    const pending = inFlightRequests.get(key);
+    if (pending) {
+      return pending;
+    }
+  }
+
+  const promise = request()
+    .then((result) => {
+      setCachedResponse(key, result);
+      return result;
+    })
+    .finally(() => {
+      if (inFlightRequests.get(key) === promise) {
+        inFlightRequests.delete(key);
+      }
+    });
+  inFlightRequests.set(key, promise);
+  return promise;
+}
+
+/**
+ * Extract the generated image from a Gemini response.
+ *
+ * The inline data is returned as-is (already base64 with its MIME type),
+ * so callers never decode and re-encode it.
+ */
+function extractImage(
+  response: GenerateContentResponse,
+  missingMessage: string
+): { data: string; mimeType: string } {
+  const parts = response.candidates?.[0]?.content?.parts;
+  if (!parts) {
+    throw new Error('No image generated');
+  }
+
+  // Find the inline data part with the image
+  const inlineData = parts.find((part) => part.inlineData?.data)?.inlineData;
+  if (!inlineData?.data) {
+    throw new Error(missingMessage);
+  }
+
+  return { data: inlineData.data, mimeType: inlineData.mimeType || 'image/png' };
+}
+
 /**
  * Check if Gemini API is configured
  */
 export async function checkGeminiStatus(): Promise<GeminiStatusResponse> {
-  const apiKey = getApiKey();
+  // Re-resolve so the status reflects keys changed outside this module
+  resolvedApiKey = resolveApiKey();
+  const apiKey = resolvedApiKey;
 
   if (!apiKey) {
     return {
@@ -41,59 +233,42 @@ export async function generateImage(
   prompt: string,
   style?: string,
   _width: number = 512,
-  _height: number = 512
+  _height: number = 512,
+  options: GeminiRequestOptions = {}
 ): Promise<GeminiGenerateResponse> {
   const apiKey = getApiKey();
   if (!apiKey) {
     throw new Error('Gemini API key not configured');
   }
 
-  const ai = new GoogleGenAI({ apiKey });
+  const ai = await getClient(apiKey);
 
   // Enhance prompt for pen plotter output
   const enhancedPrompt = enhancePromptForPlotter(prompt, style);
 
+  const cacheKey = await getCacheKey('generate', enhancedPrompt);
+
   try {
-    const response = await ai.models.generateContent({
-      model: 'gemini-3-pro-image-preview',
-      contents: enhancedPrompt,
-      config: {
-        generationConfig: {
-          imageConfig: {
-            imageSize: '2K',
+    return await runCachedRequest(cacheKey, options, async () => {
+      const response = await ai.models.generateContent({
+        model: GEMINI_IMAGE_MODEL,
+        contents: enhancedPrompt,
+        config: {
+          generationConfig: {
+            imageConfig: {
+              imageSize: '2K',
+            },
           },
-        },
-      } as any,
+        } as any,
+      });
+
+      const image = extractImage(response, 'No image data in response');
+      return {
+        image_base64: image.data,
+        mime_type: image.mimeType,
+        prompt_used: enhancedPrompt,
+      };
     });
-
-    // Get the generated image from the response
-    const candidates = response.candidates;
-    if (!candidates || candidates.length === 0) {
-      throw new Error('No image generated');
-    }
-
-    // Extract image data from the first candidate
-    const candidate = candidates[0];
-    const content = candidate.content;
-    if (!content) {
-      throw new Error('No content in candidate');
-    }
-    const parts = content.parts;
-    if (!parts) {
-      throw new Error('No parts in content');
-    }
-
-    // Find the inline data part with the image
-    const imagePart = parts.find((part: any) => part.inlineData);
-    if (!imagePart || !imagePart.inlineData || !imagePart.inlineData.data) {
-      throw new Error('No image data in response');
-    }
-
-    // Return base64 image data
-    return {
-      image_base64: imagePart.inlineData.data,
-      prompt_used: enhancedPrompt,
-    };
   } catch (error) {
     console.error('Failed to generate image:', error);
     throw error;
@@ -106,99 +281,89 @@ export async function generateImage(
 export async function processImageForPlotter(
   imageBase64: string,
   style?: string,
-  customPrompt?: string
+  customPrompt?: string,
+  options: GeminiRequestOptions = {}
 ): Promise<GeminiGenerateResponse> {
   const apiKey = getApiKey();
   if (!apiKey) {
     throw new Error('Gemini API key not configured');
   }
 
-  const ai = new GoogleGenAI({ apiKey });
+  const ai = await getClient(apiKey);
 
   // Create prompt for image conversion
   const stylePrompt = customPrompt || getStylePrompt(style);
-  const fullPrompt = `Convert this image to a pen plotter drawing. ${stylePrompt}
-
-IMPORTANT: Generate a NEW image with these specifications:
-- ONLY black lines on a COMPLETELY WHITE background
-- Vector-style line drawing, NOT a raster image
-- No gradients, no fills, no solid black areas
-- All shading must use line techniques (hatching, cross-hatching, stippling)
-- Clear, continuous lines that a physical pen can draw
-- Preserve the main subject and key features
-- Suitable for a pen plotter machine to physically draw`;
+  const fullPrompt = `Convert this image to a pen plotter drawing. ${stylePrompt}${PROCESS_PROMPT_REQUIREMENTS}`;
 
   try {
-    // Convert base64 to proper format
-    const imageData = imageBase64.replace(/^data:image\/[a-z]+;base64,/, '');
-
-    // Detect MIME type from base64 data
-    let mimeType = 'image/png';
-    if (imageBase64.startsWith('data:image/jpeg') || imageBase64.startsWith('data:image/jpg')) {
-      mimeType = 'image/jpeg';
-    } else if (imageBase64.startsWith('data:image/webp')) {
-      mimeType = 'image/webp';
-    }
-
-    const response = await ai.models.generateContent({
-      model: 'gemini-3-pro-image-preview',
-      contents: [
-        {
-          inlineData: {
-            data: imageData,
-            mimeType: mimeType,
-          },
-        },
-        fullPrompt,
-      ],
-      config: {
-        generationConfig: {
-          imageConfig: {
-            imageSize: '2K',
-          },
-        },
-      } as any,
-    });
+    // Accept either a data URL or bare base64; detect MIME type from the prefix
+    const { mimeType: dataUrlMimeType, base64: imageData } = parseDataUrl(imageBase64);
 
-    // Get the generated image from the response
-    const candidates = response.candidates;
-    if (!candidates || candidates.length === 0) {
-      throw new Error('No image generated from processing');
+    // Reject oversized or malformed payloads before hashing or uploading them
+    if (imageData.length > MAX_IMAGE_BASE64_LENGTH) {
+      throw new Error('Image is too large to process (maximum 20 MB)');
     }
-
-    // Extract image data from the first candidate
-    const candidate = candidates[0];
-    const content = candidate.content;
-    if (!content) {
-      throw new Error('No content in candidate');
-    }
-    const parts = content.parts;
-    if (!parts) {
-      throw new Error('No parts in content');
+    if (imageData.length === 0 || imageData.length % 4 !== 0) {
+      throw new Error('Invalid image data');
     }
 
-    // Find the inline data part with the image
-    const imagePart = parts.find((part: any) => part.inlineData);
-    if (!imagePart || !imagePart.inlineData || !imagePart.inlineData.data) {
-      throw new Error('No processed image data in response');
-    }
+    const mimeType = (dataUrlMimeType && GEMINI_INPUT_MIME_TYPES[dataUrlMimeType]) || 'image/png';
 
-    // Return base64 image data
-    return {
-      image_base64: imagePart.inlineData.data,
-      prompt_used: fullPrompt,
-    };
+    const cacheKey = await getCacheKey('process', fullPrompt, mimeType, imageData);
+
+    return await runCachedRequest(cacheKey, options, async () => {
+      const response = await ai.models.generateContent({
+        model: GEMINI_IMAGE_MODEL,
+        contents: [
+          {
+            inlineData: {
+              data: imageData,
+              mimeType: mimeType,
+            },
+          },
+          fullPrompt,
+        ],
+        config: {
+          generationConfig: {
+            imageConfig: {
+              imageSize: '2K',
+            },
+          },
+        } as any,
+      });
+
+      const image = extractImage(response, 'No processed image data in response');
+      return {
+        image_base64: image.data,
+        mime_type: image.mimeType,
+        prompt_used: fullPrompt,
+      };
+    });
   } catch (error) {
     console.error('Failed to process image:', error);
     throw error;
   }
 }
 
+// Resolved API key; undefined until first resolved. Kept in sync by
+// setGeminiApiKey/clearGeminiApiKey so requests skip the storage lookup.
+let resolvedApiKey: string | null | undefined;
+
+/**
+ * Get the API key, resolving it from its sources only once
+ */
+function getApiKey(): string | null {
+  if (resolvedApiKey === undefined) {
+    resolvedApiKey = resolveApiKey();
+  }
+  return resolvedApiKey;
+}
+
 /**
  * Get API key from various sources
  * Priority: Environment variable > Tauri (desktop) > localStorage (user-provided)
  */
-function getApiKey(): string | null {
+function resolveApiKey(): string | null {
   // 1. Check environment variable (web build-time or dev)
   const envKey = import.meta.env.VITE_GEMINI_API_KEY;
   if (envKey && envKey !== 'your_api_key_here') return envKey;
@@ -219,6 +384,7 @@ function getApiKey(): string | null {
  */
 export function setGeminiApiKey(apiKey: string): void {
   localStorage.setItem('gemini_api_key', apiKey);
+  resolvedApiKey = undefined;
 }
 
 /**
@@ -226,48 +392,20 @@ export function setGeminiApiKey(apiKey: string): void {
  */
 export function clearGeminiApiKey(): void {
   localStorage.removeItem('gemini_api_key');
+  resolvedApiKey = undefined;
+  cachedClient = null;
 }
 
 /**
  * Enhance prompt for pen plotter output
  */
 function enhancePromptForPlotter(prompt: string, style?: string): string {
-  const styleInstructions = getStylePrompt(style);
-
-  return `${prompt}. ${styleInstructions}
-
-IMPORTANT: This image will be used by a physical pen plotter machine.
-- Use ONLY black line outlines on a COMPLETELY WHITE background
-- Create vector-style line drawings, NOT raster images or photographs
-- No gradients, no shading with fills, no solid black areas
-- All shading must be done with line techniques (hatching, cross-hatching, stippling)
-- Make lines clear, distinct, and continuous so a pen can physically draw them
-- Think of it as a drawing made by a single pen on white paper
-- Use moderate detail that preserves recognizability while being plotter-friendly`;
+  return `${prompt}. ${getStylePrompt(style)}${GENERATE_PROMPT_REQUIREMENTS}`;
 }
 
 /**
  * Get style-specific prompt instructions
  */
 function getStylePrompt(style?: string): string {
-  const styleInstructions: Record<string, string> = {
-    // Classic styles
-    line_art: 'Create as clean line art with bold outlines, suitable for pen plotting.',
-    sketch: 'Create as a sketch with varied line weights, suitable for pen plotting.',
-    minimal: 'Create as minimal line drawing with simple shapes, suitable for pen plotting.',
-    detailed: 'Create as detailed line illustration with cross-hatching for shading, suitable for pen plotting.',
-    // Advanced styles
-    continuous: 'Create as a CONTINUOUS SINGLE-LINE drawing where the pen NEVER lifts from the paper. The entire image must be ONE unbroken line that weaves and loops to form all shapes and shading. Like a TSP (traveling salesman) art piece - one continuous path that traces the entire drawing.',
-    geometric: 'Recreate the image using ONLY geometric shapes - triangles, circles, squares, hexagons, and polygons. Create a low-poly or mosaic effect where the subject is built entirely from flat geometric primitives with clean edges.',
-    spiral: 'Create as a SINGLE SPIRAL drawing starting from the center and spiraling outward. Vary the line thickness or waviness to represent light and dark areas. The result should look like a vinyl record or fingerprint pattern that reveals the image.',
-    stippling: 'Create using ONLY DOTS (stippling/pointillism technique). No continuous lines - represent all shading and form through varying density of small dots. Darker areas have more densely packed dots, lighter areas have sparse dots.',
-    hatching: 'Create using ONLY PARALLEL HATCHING LINES like an engraving or etching. Use different line angles and densities to create form and shading. Think of classic currency engraving or woodcut print style.',
-    contour: 'Create as TOPOGRAPHIC CONTOUR LINES, like an elevation map. Draw concentric lines that follow the "elevation" of brightness in the image. Results should look like terrain contour maps or fingerprints.',
-    ascii: 'Create as ASCII TEXT ART where the image is represented by text characters arranged in a grid. Use denser characters (@ # M W) for dark areas and lighter characters (. : -) for light areas. The result should be readable as monospace text art.',
-    cubist: 'Create in CUBIST style like Picasso - fragment the subject into geometric angular planes, show multiple perspectives simultaneously, use bold intersecting lines. Abstract but recognizable, with fragmented overlapping forms.',
-    wireframe: 'Create as a 3D WIREFRAME model - imagine the subject as a mesh of connected vertices. Draw grid-like lines over the 3D form surface, like retro computer graphics or CAD model visualization.',
-    circuit: 'Create as a CIRCUIT BOARD design - use only straight lines with 90-degree angles, add connection points as small circles at intersections. Make it look like an electronic PCB schematic that forms the image.',
-  };
-
-  return styleInstructions[style || 'line_art'] || styleInstructions.line_art;
+  return STYLE_PROMPTS[style || 'line_art'] || STYLE_PROMPTS.line_art;
 }
@@ -23,6 +23,15 @@ import {
   STEPS_PER_MM,
 } from './types';
 
+// Response patterns, shared by every command and status poll
+const GRBL_ERROR_REGEX = /error:(\d*)/i;
+const GRBL_ALARM_REGEX = /ALARM(?::(\d+))?/i;
+const STATUS_STATE_REGEX = /<(\w+)\|/;
+const STATUS_MPOS_REGEX = /MPos:([-\d.]+),([-\d.]+),([-\d.]+)/;
+const STATUS_WPOS_REGEX = /WPos:([-\d.]+),([-\d.]+),([-\d.]+)/;
+const STATUS_FS_REGEX = /FS:(\d+),(\d+)/;
+const STATUS_PINS_REGEX = /Pn:([XYZPDHRS]+)/;
+
 /**
  * High-level GRBL command interface for iDraw 2.0 with DrawCore firmware.
  */
@@ -33,6 +42,7 @@ export class GRBLCommands {
   private _currentY: number = 0;
   private _currentZ: number = 0;
   private _isInitialized: boolean = false;
+  private _firmwareVersion: string | null = null;  // Fixed for the connection's lifetime
 
   // Configurable pen heights
   private _penUpZ: number = PEN_HEIGHTS.UP;
@@ -68,14 +78,10 @@ export class GRBLCommands {
    * - Syncs current position from status query
    */
   async initialize(): Promise<void> {
-    // Set millimeter units
-    await this._sendGcode('G21');
-
-    // Set absolute positioning mode
-    await this._sendGcode('G90');
-
-    // Set XY plane
-    await this._sendGcode('G17');
+    // Millimeter units, absolute positioning, XY plane. These are in
+    // different modal groups, so GRBL accepts them as one block - one
+    // round-trip instead of three.
+    await this._sendGcode('G21 G90 G17');
 
     // Query current position
     const status = await this.queryStatus();
@@ -96,9 +102,15 @@ export class GRBLCommands {
 
   /**
    * Query firmware version.
+   *
+   * The result is cached, since the firmware can't change without a
+   * reconnect (which creates a new GRBLCommands instance).
    */
   async getVersion(): Promise<string> {
-    return await this._conn.sendCommand('$I');
+    if (this._firmwareVersion === null) {
+      this._firmwareVersion = await this._conn.sendCommand('$I');
+    }
+    return this._firmwareVersion;
   }
 
   // === Pen Control ===
@@ -458,17 +470,17 @@ export class GRBLCommands {
   private async _sendGcode(gcode: string, timeout: number = 5000): Promise<string> {
     const response = await this._conn.sendCommand(gcode, timeout);
 
-    // Check for error response
-    if (response.toLowerCase().includes('error:')) {
-      const errorMatch = response.toLowerCase().match(/error:(\d+)/);
-      const errorCode = errorMatch ? errorMatch[1] : 'unknown';
+    // Check for error response (one case-insensitive match, no lower-cased copy)
+    const errorMatch = response.match(GRBL_ERROR_REGEX);
+    if (errorMatch) {
+      const errorCode = errorMatch[1] || 'unknown';
       throw this._createGRBLError('PLT-X003', 'Command rejected', response, gcode, errorCode);
     }
 
     // Check for alarm
-    if (response.toUpperCase().includes('ALARM')) {
-      const alarmMatch = response.toUpperCase().match(/ALARM:(\d+)/);
-      const alarmCode = alarmMatch ? alarmMatch[1] : 'unknown';
+    const alarmMatch = response.match(GRBL_ALARM_REGEX);
+    if (alarmMatch) {
+      const alarmCode = alarmMatch[1] || 'unknown';
       throw this._createGRBLError('PLT-G001', 'GRBL alarm triggered', response, gcode, undefined, alarmCode);
     }
 
@@ -483,13 +495,13 @@ export class GRBLCommands {
     let pins: string | undefined;
 
     // Extract state
-    const stateMatch = response.match(/<(\w+)\|/);
+    const stateMatch = response.match(STATUS_STATE_REGEX);
     if (stateMatch) {
       state = stateMatch[1] as GRBLState;
     }
 
     // Extract machine position
-    const mposMatch = response.match(/MPos:([-\d.]+),([-\d.]+),([-\d.]+)/);
+    const mposMatch = response.match(STATUS_MPOS_REGEX);
     if (mposMatch) {
       mx = parseFloat(mposMatch[1]);
       my = parseFloat(mposMatch[2]);
@@ -497,7 +509,7 @@ export class GRBLCommands {
     }
 
     // Extract work position (if present)
-    const wposMatch = response.match(/WPos:([-\d.]+),([-\d.]+),([-\d.]+)/);
+    const wposMatch = response.match(STATUS_WPOS_REGEX);
     if (wposMatch) {
       wx = parseFloat(wposMatch[1]);
       wy = parseFloat(wposMatch[2]);
@@ -505,14 +517,14 @@ export class GRBLCommands {
     }
 
     // Extract feed rate and spindle speed
-    const fsMatch = response.match(/FS:(\d+),(\d+)/);
+    const fsMatch = response.match(STATUS_FS_REGEX);
     if (fsMatch) {
       feed = parseFloat(fsMatch[1]);
       spindle = parseFloat(fsMatch[2]);
     }
 
     // Extract pin states
-    const pnMatch = response.match(/Pn:([XYZPDHRS]+)/);
+    const pnMatch = response.match(STATUS_PINS_REGEX);
     if (pnMatch) {
       pins = pnMatch[1];
     }
@@ -13,6 +13,9 @@ import {
   PaperConfig,
 } from './types';
 
+/** Minimum interval between 'plotting' progress reports (~20 Hz) */
+const PROGRESS_INTERVAL_MS = 50;
+
 /** Progress callback function type */
 export type ProgressCallback = (progress: PlotProgress) => void;
 
@@ -144,6 +147,7 @@ export class PlotExecutor {
     this._pauseRequested = false;
     const total = plotCommands.length;
     this._currentCommandIndex = 0;
+    let lastProgressTime = 0;
 
     try {
       // Check voltage before starting
@@ -254,8 +258,11 @@ export class PlotExecutor {
         // Execute command (streams to GRBL buffer, doesn't block)
         await this._executeCommand(cmd);
 
-        // Report progress
-        if (onProgress) {
+        // Report progress, rate-limited - streaming can complete hundreds of
+        // commands per second. Terminal states below are always reported.
+        const now = performance.now();
+        if (onProgress && now - lastProgressTime >= PROGRESS_INTERVAL_MS) {
+          lastProgressTime = now;
           onProgress({
             state: 'plotting',
             currentCommand: i + 1,
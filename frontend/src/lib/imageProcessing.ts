@@ -9,6 +9,27 @@ export interface ProcessImageOptions {
   padding?: number;
 }
 
+/**
+ * Encode a canvas as a PNG data URL.
+ *
+ * Uses toBlob, which encodes off the main thread, instead of the
+ * synchronous toDataURL that blocks the UI for large images.
+ */
+function canvasToPngDataUrl(canvas: HTMLCanvasElement): Promise<string> {
+  return new Promise((resolve, reject) => {
+    canvas.toBlob((blob) => {
+      if (!blob) {
+        reject(new Error('Failed to encode image'));
+        return;
+      }
+      const reader = new FileReader();
+      reader.onload = () => resolve(reader.result as string);
+      reader.onerror = () => reject(new Error('Failed to encode image'));
+      reader.readAsDataURL(blob);
+    }, 'image/png');
+  });
+}
+
 /**
  * Remove white background and auto-crop an image
  */
@@ -30,9 +51,10 @@ export async function preprocessImage(
     const img = new Image();
     img.onload = () => {
       try {
-        // Create canvas with image
+        // Create canvas with image. Pixels are read back right after the draw,
+        // so ask for a CPU-backed canvas to avoid a GPU readback copy
         const canvas = document.createElement('canvas');
-        const ctx = canvas.getContext('2d');
+        const ctx = canvas.getContext('2d', { willReadFrequently: true });
         if (!ctx) {
           reject(new Error('Failed to get canvas context'));
           return;
@@ -46,52 +68,85 @@ export async function preprocessImage(
         const imageData = ctx.getImageData(0, 0, canvas.width, canvas.height);
         const data = imageData.data;
 
-        // Find bounding box of non-white pixels
-        let minX = canvas.width;
-        let minY = canvas.height;
-        let maxX = 0;
-        let maxY = 0;
-
-        for (let y = 0; y < canvas.height; y++) {
-          for (let x = 0; x < canvas.width; x++) {
-            const idx = (y * canvas.width + x) * 4;
-            const r = data[idx];
-            const g = data[idx + 1];
-            const b = data[idx + 2];
-            const a = data[idx + 3];
-
-            // Check if pixel is not white (below threshold)
-            if (a > 0 && (r < threshold || g < threshold || b < threshold)) {
-              minX = Math.min(minX, x);
-              minY = Math.min(minY, y);
-              maxX = Math.max(maxX, x);
-              maxY = Math.max(maxY, y);
-            } else {
-              // Make white pixels transparent
-              data[idx + 3] = 0;
-            }
+        const width = canvas.width;
+        const height = canvas.height;
+
+        // A pixel is content if it is visible and not white (below threshold)
+        const isContent = (idx: number): boolean =>
+          data[idx + 3] > 0 &&
+          (data[idx] < threshold || data[idx + 1] < threshold || data[idx + 2] < threshold);
+
+        const rowHasContent = (y: number): boolean => {
+          const rowEnd = (y + 1) * width * 4;
+          for (let idx = y * width * 4; idx < rowEnd; idx += 4) {
+            if (isContent(idx)) return true;
           }
-        }
+          return false;
+        };
+
+        // Find first and last content rows, stopping at the first hit from
+        // each end so margins are never scanned twice
+        let minY = 0;
+        while (minY < height && !rowHasContent(minY)) minY++;
 
-        // Check if we found any content
-        if (maxX < minX || maxY < minY) {
+        if (minY === height) {
           // No content found, return original
           resolve(imageDataUrl);
           return;
         }
 
+        let maxY = height - 1;
+        while (maxY > minY && !rowHasContent(maxY)) maxY--;
+
+        // Find column extent within the content rows; each row only needs to
+        // be scanned up to the extent found so far
+        let minX = width;
+        let maxX = -1;
+        for (let y = minY; y <= maxY; y++) {
+          const rowStart = y * width * 4;
+          for (let x = 0; x < minX; x++) {
+            if (isContent(rowStart + x * 4)) {
+              minX = x;
+              break;
+            }
+          }
+          for (let x = width - 1; x > maxX; x--) {
+            if (isContent(rowStart + x * 4)) {
+              maxX = x;
+              break;
+            }
+          }
+        }
+
         // Apply padding
         minX = Math.max(0, minX - padding);
         minY = Math.max(0, minY - padding);
-        maxX = Math.min(canvas.width - 1, maxX + padding);
-        maxY = Math.min(canvas.height - 1, maxY + padding);
+        maxX = Math.min(width - 1, maxX + padding);
+        maxY = Math.min(height - 1, maxY + padding);
 
         // Calculate crop dimensions
         const cropWidth = maxX - minX + 1;
         const cropHeight = maxY - minY + 1;
 
-        // Put processed image data back
-        ctx.putImageData(imageData, 0, 0);
+        // Make white pixels transparent; only the cropped region is written
+        // out, so pixels outside it are left untouched
+        let hasBackground = cropWidth < width || cropHeight < height;
+        for (let y = minY; y <= maxY; y++) {
+          let idx = (y * width + minX) * 4;
+          for (let x = minX; x <= maxX; x++, idx += 4) {
+            if (!isContent(idx)) {
+              data[idx + 3] = 0;
+              hasBackground = true;
+            }
+          }
+        }
+
+        // Every pixel is content: nothing to make transparent or crop, so
+        // skip the canvas write and PNG re-encode
+        if (!hasBackground) {
+          resolve(imageDataUrl);
+          return;
+        }
 
         // Create new canvas with cropped size
         const croppedCanvas = document.createElement('canvas');
@@ -104,16 +159,17 @@ export async function preprocessImage(
         croppedCanvas.width = cropWidth;
         croppedCanvas.height = cropHeight;
 
-        // Copy cropped region
-        croppedCtx.drawImage(
-          canvas,
-          minX, minY, cropWidth, cropHeight,
-          0, 0, cropWidth, cropHeight
+        // Write only the cropped region of the processed pixels straight into
+        // the output canvas, instead of writing the full image back and then
+        // copying the crop out of it
+        croppedCtx.putImageData(
+          imageData,
+          -minX, -minY,
+          minX, minY, cropWidth, cropHeight
         );
 
         // Convert to data URL
-        const processedDataUrl = croppedCanvas.toDataURL('image/png');
-        resolve(processedDataUrl);
+        canvasToPngDataUrl(croppedCanvas).then(resolve, reject);
       } catch (error) {
         reject(error);
       }
@@ -132,7 +188,7 @@ export async function convertToGrayscale(imageDataUrl: string): Promise<string>
     img.onload = () => {
       try {
         const canvas = document.createElement('canvas');
-        const ctx = canvas.getContext('2d');
+        const ctx = canvas.getContext('2d', { willReadFrequently: true });
         if (!ctx) {
           reject(new Error('Failed to get canvas context'));
           return;
@@ -146,14 +202,16 @@ export async function convertToGrayscale(imageDataUrl: string): Promise<string>
         const data = imageData.data;
 
         for (let i = 0; i < data.length; i += 4) {
-          const gray = 0.299 * data[i] + 0.587 * data[i + 1] + 0.114 * data[i + 2];
+          // Rec. 601 luma in 8.8 fixed point (77 + 150 + 29 = 256), so the
+          // loop stays in integer math instead of float multiply + round
+          const gray = (77 * data[i] + 150 * data[i + 1] + 29 * data[i + 2] + 128) >> 8;
           data[i] = gray;
           data[i + 1] = gray;
           data[i + 2] = gray;
         }
 
         ctx.putImageData(imageData, 0, 0);
-        resolve(canvas.toDataURL('image/png'));
+        canvasToPngDataUrl(canvas).then(resolve, reject);
       } catch (error) {
         reject(error);
       }
@@ -283,6 +283,12 @@ export class PlotterService {
       throw new Error('Executor not initialized');
     }
 
+    // The executor holds per-plot state (position, cancel/pause flags), so a
+    // second plot must not start while one is running or paused.
+    if (this._state === 'plotting' || this._state === 'paused') {
+      throw new Error('A plot is already in progress');
+    }
+
     this._setState('plotting');
 
     try {
@@ -36,6 +36,12 @@ export interface SvgToCommandsOptions {
   optimizePaths?: boolean;
 }
 
+/**
+ * Path data tokens: a command letter or a number. Numbers may run together
+ * without separators ("10-5", "1.5.5" = 1.5 .5) and use exponents.
+ */
+const PATH_TOKEN_REGEX = /[MmLlHhVvZzCcSsQqTtAa]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?/g;
+
 /**
  * Parse an SVG path's `d` attribute into an array of points.
  * Supports M, L, H, V, Z commands (absolute and relative).
@@ -47,15 +53,8 @@ function parsePathD(d: string): Point[] {
   let startX = 0;
   let startY = 0;
 
-  // Normalize path data: ensure space after commands
-  const normalized = d
-    .replace(/([MmLlHhVvZzCcSsQqTtAa])/g, ' $1 ')
-    .replace(/,/g, ' ')
-    .replace(/-/g, ' -')
-    .replace(/\s+/g, ' ')
-    .trim();
-
-  const tokens = normalized.split(' ').filter((t) => t !== '');
+  // Tokenize commands and numbers in one pass
+  const tokens = d.match(PATH_TOKEN_REGEX) ?? [];
   let i = 0;
 
   while (i < tokens.length) {
@@ -153,10 +152,9 @@ function parsePathD(d: string): Point[] {
           const x = parseFloat(tokens[i++]);
           const y = parseFloat(tokens[i++]);
           // Approximate cubic bezier with line segments
-          const bezierPoints = approximateCubicBezier(
-            currentX, currentY, x1, y1, x2, y2, x, y, 8
+          approximateCubicBezier(
+            points, currentX, currentY, x1, y1, x2, y2, x, y, 8
           );
-          points.push(...bezierPoints.slice(1)); // Skip first point (current position)
           currentX = x;
           currentY = y;
         }
@@ -170,14 +168,13 @@ function parsePathD(d: string): Point[] {
           const dy2 = parseFloat(tokens[i++]);
           const dx = parseFloat(tokens[i++]);
           const dy = parseFloat(tokens[i++]);
-          const bezierPoints = approximateCubicBezier(
-            currentX, currentY,
+          approximateCubicBezier(
+            points, currentX, currentY,
             currentX + dx1, currentY + dy1,
             currentX + dx2, currentY + dy2,
             currentX + dx, currentY + dy,
             8
           );
-          points.push(...bezierPoints.slice(1));
           currentX += dx;
           currentY += dy;
         }
@@ -193,10 +190,9 @@ function parsePathD(d: string): Point[] {
           // For simplicity, use current point as control
           const x1 = currentX;
           const y1 = currentY;
-          const bezierPoints = approximateCubicBezier(
-            currentX, currentY, x1, y1, x2, y2, x, y, 8
+          approximateCubicBezier(
+            points, currentX, currentY, x1, y1, x2, y2, x, y, 8
           );
-          points.push(...bezierPoints.slice(1));
           currentX = x;
           currentY = y;
         }
@@ -210,12 +206,11 @@ function parsePathD(d: string): Point[] {
           const dy = parseFloat(tokens[i++]);
           const x1 = currentX;
           const y1 = currentY;
-          const bezierPoints = approximateCubicBezier(
-            currentX, currentY, x1, y1,
+          approximateCubicBezier(
+            points, currentX, currentY, x1, y1,
             currentX + dx2, currentY + dy2,
             currentX + dx, currentY + dy, 8
           );
-          points.push(...bezierPoints.slice(1));
           currentX += dx;
           currentY += dy;
         }
@@ -227,10 +222,9 @@ function parsePathD(d: string): Point[] {
           const y1 = parseFloat(tokens[i++]);
           const x = parseFloat(tokens[i++]);
           const y = parseFloat(tokens[i++]);
-          const bezierPoints = approximateQuadraticBezier(
-            currentX, currentY, x1, y1, x, y, 8
+          approximateQuadraticBezier(
+            points, currentX, currentY, x1, y1, x, y, 8
           );
-          points.push(...bezierPoints.slice(1));
           currentX = x;
           currentY = y;
         }
@@ -242,13 +236,12 @@ function parsePathD(d: string): Point[] {
           const dy1 = parseFloat(tokens[i++]);
           const dx = parseFloat(tokens[i++]);
           const dy = parseFloat(tokens[i++]);
-          const bezierPoints = approximateQuadraticBezier(
-            currentX, currentY,
+          approximateQuadraticBezier(
+            points, currentX, currentY,
             currentX + dx1, currentY + dy1,
             currentX + dx, currentY + dy,
             8
           );
-          points.push(...bezierPoints.slice(1));
           currentX += dx;
           currentY += dy;
         }
@@ -262,10 +255,9 @@ function parsePathD(d: string): Point[] {
           // For simplicity, use current point
           const x1 = currentX;
           const y1 = currentY;
-          const bezierPoints = approximateQuadraticBezier(
-            currentX, currentY, x1, y1, x, y, 8
+          approximateQuadraticBezier(
+            points, currentX, currentY, x1, y1, x, y, 8
           );
-          points.push(...bezierPoints.slice(1));
           currentX = x;
           currentY = y;
         }
@@ -277,11 +269,10 @@ function parsePathD(d: string): Point[] {
           const dy = parseFloat(tokens[i++]);
           const x1 = currentX;
           const y1 = currentY;
-          const bezierPoints = approximateQuadraticBezier(
-            currentX, currentY, x1, y1,
+          approximateQuadraticBezier(
+            points, currentX, currentY, x1, y1,
             currentX + dx, currentY + dy, 8
           );
-          points.push(...bezierPoints.slice(1));
           currentX += dx;
           currentY += dy;
         }
@@ -297,10 +288,9 @@ function parsePathD(d: string): Point[] {
           const x = parseFloat(tokens[i++]);
           const y = parseFloat(tokens[i++]);
 
-          const arcPoints = approximateEllipticalArc(
-            currentX, currentY, rx, ry, xAxisRotation, largeArcFlag, sweepFlag, x, y, 16
+          approximateEllipticalArc(
+            points, currentX, currentY, rx, ry, xAxisRotation, largeArcFlag, sweepFlag, x, y, 16
           );
-          points.push(...arcPoints.slice(1));
           currentX = x;
           currentY = y;
         }
@@ -316,11 +306,10 @@ function parsePathD(d: string): Point[] {
           const dx = parseFloat(tokens[i++]);
           const dy = parseFloat(tokens[i++]);
 
-          const arcPoints = approximateEllipticalArc(
-            currentX, currentY, rx, ry, xAxisRotation, largeArcFlag, sweepFlag,
+          approximateEllipticalArc(
+            points, currentX, currentY, rx, ry, xAxisRotation, largeArcFlag, sweepFlag,
             currentX + dx, currentY + dy, 16
           );
-          points.push(...arcPoints.slice(1));
           currentX += dx;
           currentY += dy;
         }
@@ -338,16 +327,17 @@ function parsePathD(d: string): Point[] {
 
 /**
  * Approximate a cubic bezier curve with line segments.
+ * Appends the points after the start point (the current position) to `out`.
  */
 function approximateCubicBezier(
+  out: Point[],
   x0: number, y0: number,
   x1: number, y1: number,
   x2: number, y2: number,
   x3: number, y3: number,
   segments: number
-): Point[] {
-  const points: Point[] = [];
-  for (let i = 0; i <= segments; i++) {
+): void {
+  for (let i = 1; i <= segments; i++) {
     const t = i / segments;
     const t2 = t * t;
     const t3 = t2 * t;
@@ -357,37 +347,38 @@ function approximateCubicBezier(
 
     const x = mt3 * x0 + 3 * mt2 * t * x1 + 3 * mt * t2 * x2 + t3 * x3;
     const y = mt3 * y0 + 3 * mt2 * t * y1 + 3 * mt * t2 * y2 + t3 * y3;
-    points.push({ x, y });
+    out.push({ x, y });
   }
-  return points;
 }
 
 /**
  * Approximate a quadratic bezier curve with line segments.
+ * Appends the points after the start point (the current position) to `out`.
  */
 function approximateQuadraticBezier(
+  out: Point[],
   x0: number, y0: number,
   x1: number, y1: number,
   x2: number, y2: number,
   segments: number
-): Point[] {
-  const points: Point[] = [];
-  for (let i = 0; i <= segments; i++) {
+): void {
+  for (let i = 1; i <= segments; i++) {
     const t = i / segments;
     const mt = 1 - t;
     const x = mt * mt * x0 + 2 * mt * t * x1 + t * t * x2;
     const y = mt * mt * y0 + 2 * mt * t * y1 + t * t * y2;
-    points.push({ x, y });
+    out.push({ x, y });
   }
-  return points;
 }
 
 /**
  * Approximate an elliptical arc with line segments.
  * Implements SVG elliptical arc algorithm from the spec:
  * https://www.w3.org/TR/SVG/implnotes.html#ArcImplementationNotes
+ * Appends the points after the start point (the current position) to `out`.
  */
 function approximateEllipticalArc(
+  out: Point[],
   x1: number, y1: number,
   rx: number, ry: number,
   phi: number,
@@ -395,10 +386,11 @@ function approximateEllipticalArc(
   fS: number,
   x2: number, y2: number,
   segments: number
-): Point[] {
+): void {
   // Handle degenerate cases
   if (rx === 0 || ry === 0) {
-    return [{ x: x1, y: y1 }, { x: x2, y: y2 }];
+    out.push({ x: x2, y: y2 });
+    return;
   }
 
   // Ensure radii are positive
@@ -466,8 +458,7 @@ function approximateEllipticalArc(
   }
 
   // Generate points along the arc
-  const points: Point[] = [];
-  for (let i = 0; i <= segments; i++) {
+  for (let i = 1; i <= segments; i++) {
     const t = i / segments;
     const angle = theta1 + t * dTheta;
 
@@ -477,118 +468,175 @@ function approximateEllipticalArc(
     const x = cosPhi * rx * cosAngle - sinPhi * ry * sinAngle + cx;
     const y = sinPhi * rx * cosAngle + cosPhi * ry * sinAngle + cy;
 
-    points.push({ x, y });
+    out.push({ x, y });
   }
+}
 
+/**
+ * Parse a `points` attribute into points, optionally closing the shape.
+ */
+function parsePointsAttr(pointsStr: string, close: boolean): Point[] {
+  const coords = pointsStr.trim().split(/[\s,]+/).filter((c) => c !== '');
+  const points: Point[] = [];
+  for (let i = 0; i + 1 < coords.length; i += 2) {
+    points.push({ x: parseFloat(coords[i]), y: parseFloat(coords[i + 1]) });
+  }
+  if (close && points.length > 1) {
+    const first = points[0];
+    const last = points[points.length - 1];
+    if (first.x !== last.x || first.y !== last.y) {
+      points.push({ x: first.x, y: first.y });
+    }
+  }
   return points;
 }
 
 /**
- * Extract all paths from SVG string.
+ * Approximate an ellipse (or circle) with a closed polyline.
  */
-function extractPathsFromSvg(svgString: string): string[] {
-  const paths: string[] = [];
+function approximateEllipse(cx: number, cy: number, rx: number, ry: number): Point[] {
+  const segments = Math.max(16, Math.ceil(Math.max(rx, ry) * 2)); // More segments for larger shapes
+  const points: Point[] = [];
+  for (let i = 0; i <= segments; i++) {
+    const angle = (i / segments) * 2 * Math.PI;
+    points.push({ x: cx + rx * Math.cos(angle), y: cy + ry * Math.sin(angle) });
+  }
+  return points;
+}
 
-  // Match <path d="..."/> elements
-  const pathRegex = /<path[^>]*\sd=["']([^"']+)["'][^>]*>/gi;
+/** Opening tags of every drawable element, matched in one pass */
+const DRAWABLE_ELEMENT_REGEX = /<(path|line|polyline|polygon|rect|circle|ellipse)\b([^>]*)>/gi;
+
+/** name="value" / name='value' pairs inside a tag */
+const ATTRIBUTE_REGEX = /([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')/g;
+
+/**
+ * Parse the attribute text of a tag into a name -> value map.
+ */
+function parseAttributes(attrText: string): Record<string, string> {
+  const attrs: Record<string, string> = {};
+  ATTRIBUTE_REGEX.lastIndex = 0;
   let match;
-  while ((match = pathRegex.exec(svgString)) !== null) {
-    paths.push(match[1]);
+  while ((match = ATTRIBUTE_REGEX.exec(attrText)) !== null) {
+    attrs[match[1].toLowerCase()] = match[2] ?? match[3];
   }
+  return attrs;
+}
 
-  // Match <line> elements
-  const lineRegex = /<line[^>]*x1=["']([^"']+)["'][^>]*y1=["']([^"']+)["'][^>]*x2=["']([^"']+)["'][^>]*y2=["']([^"']+)["'][^>]*>/gi;
-  while ((match = lineRegex.exec(svgString)) !== null) {
-    const [, x1, y1, x2, y2] = match;
-    paths.push(`M${x1},${y1}L${x2},${y2}`);
-  }
+/**
+ * Parse an absolute length attribute. Percentages resolve against the
+ * viewport, which isn't known here, so they (and non-numbers) give NaN.
+ */
+function parseLength(value: string): number {
+  return value.trim().endsWith('%') ? NaN : parseFloat(value);
+}
 
-  // Match <polyline> elements
-  const polylineRegex = /<polyline[^>]*points=["']([^"']+)["'][^>]*>/gi;
-  while ((match = polylineRegex.exec(svgString)) !== null) {
-    const pointsStr = match[1].trim();
-    const coords = pointsStr.split(/[\s,]+/).filter((c) => c !== '');
-    if (coords.length >= 4) {
-      let d = `M${coords[0]},${coords[1]}`;
-      for (let i = 2; i < coords.length; i += 2) {
-        d += `L${coords[i]},${coords[i + 1]}`;
-      }
-      paths.push(d);
-    }
+/** fill/stroke declarations inside an inline style attribute */
+const STYLE_PAINT_REGEX = {
+  fill: /(?:^|;)\s*fill\s*:\s*([^;]+)/i,
+  stroke: /(?:^|;)\s*stroke\s*:\s*([^;]+)/i,
+};
+
+/**
+ * Read a paint property (fill/stroke) from its attribute or inline style.
+ */
+function getPaint(attrs: Record<string, string>, name: 'fill' | 'stroke'): string | undefined {
+  if (attrs[name] !== undefined) {
+    return attrs[name].trim().toLowerCase();
   }
+  const match = attrs.style?.match(STYLE_PAINT_REGEX[name]);
+  return match ? match[1].trim().toLowerCase() : undefined;
+}
 
-  // Match <polygon> elements
-  const polygonRegex = /<polygon[^>]*points=["']([^"']+)["'][^>]*>/gi;
-  while ((match = polygonRegex.exec(svgString)) !== null) {
-    const pointsStr = match[1].trim();
-    const coords = pointsStr.split(/[\s,]+/).filter((c) => c !== '');
-    if (coords.length >= 4) {
-      let d = `M${coords[0]},${coords[1]}`;
-      for (let i = 2; i < coords.length; i += 2) {
-        d += `L${coords[i]},${coords[i + 1]}`;
-      }
-      d += 'Z';
-      paths.push(d);
+/**
+ * Check for a rect with an explicit fill and no stroke, like a page
+ * background. It has no outline for the pen to trace.
+ */
+function isFillOnlyRect(attrs: Record<string, string>): boolean {
+  const stroke = getPaint(attrs, 'stroke');
+  const fill = getPaint(attrs, 'fill');
+  return (stroke === undefined || stroke === 'none') && fill !== undefined && fill !== 'none';
+}
+
+/**
+ * Extract all drawable elements from an SVG string as point sequences.
+ *
+ * Elements are found with a single scan in document order. <path> data is
+ * parsed with parsePathD; primitive shapes are converted to points
+ * directly rather than via an intermediate `d` string.
+ */
+function extractSegmentsFromSvg(svgString: string): PathSegment[] {
+  const segments: PathSegment[] = [];
+  const addSegment = (points: Point[]) => {
+    if (points.length > 0) {
+      segments.push({ points });
     }
-  }
+  };
+  // Missing numeric attributes default to 0, as in SVG
+  const num = (value: string | undefined) => (value === undefined ? 0 : parseFloat(value));
 
-  // Match <rect> elements
-  const rectRegex = /<rect[^>]*x=["']([^"']+)["'][^>]*y=["']([^"']+)["'][^>]*width=["']([^"']+)["'][^>]*height=["']([^"']+)["'][^>]*>/gi;
-  while ((match = rectRegex.exec(svgString)) !== null) {
-    const [, x, y, w, h] = match;
-    const xf = parseFloat(x);
-    const yf = parseFloat(y);
-    const wf = parseFloat(w);
-    const hf = parseFloat(h);
-    paths.push(`M${xf},${yf}L${xf + wf},${yf}L${xf + wf},${yf + hf}L${xf},${yf + hf}Z`);
-  }
+  DRAWABLE_ELEMENT_REGEX.lastIndex = 0;
+  let match;
+  while ((match = DRAWABLE_ELEMENT_REGEX.exec(svgString)) !== null) {
+    const attrs = parseAttributes(match[2]);
+
+    switch (match[1].toLowerCase()) {
+      case 'path':
+        if (attrs.d) {
+          addSegment(parsePathD(attrs.d));
+        }
+        break;
+
+      case 'line':
+        addSegment([
+          { x: num(attrs.x1), y: num(attrs.y1) },
+          { x: num(attrs.x2), y: num(attrs.y2) },
+        ]);
+        break;
 
-  // Match <circle> elements - approximate with polygon
-  const circleRegex = /<circle[^>]*cx=["']([^"']+)["'][^>]*cy=["']([^"']+)["'][^>]*r=["']([^"']+)["'][^>]*>/gi;
-  while ((match = circleRegex.exec(svgString)) !== null) {
-    const [, cx, cy, r] = match;
-    const cxf = parseFloat(cx);
-    const cyf = parseFloat(cy);
-    const rf = parseFloat(r);
-    const segments = Math.max(16, Math.ceil(rf * 2)); // More segments for larger circles
-    let d = '';
-    for (let i = 0; i <= segments; i++) {
-      const angle = (i / segments) * 2 * Math.PI;
-      const px = cxf + rf * Math.cos(angle);
-      const py = cyf + rf * Math.sin(angle);
-      if (i === 0) {
-        d += `M${px},${py}`;
-      } else {
-        d += `L${px},${py}`;
+      case 'polyline':
+      case 'polygon': {
+        if (!attrs.points) break;
+        const points = parsePointsAttr(attrs.points, match[1].toLowerCase() === 'polygon');
+        if (points.length >= 2) {
+          addSegment(points);
+        }
+        break;
       }
-    }
-    paths.push(d);
-  }
 
-  // Match <ellipse> elements - approximate with polygon
-  const ellipseRegex = /<ellipse[^>]*cx=["']([^"']+)["'][^>]*cy=["']([^"']+)["'][^>]*rx=["']([^"']+)["'][^>]*ry=["']([^"']+)["'][^>]*>/gi;
-  while ((match = ellipseRegex.exec(svgString)) !== null) {
-    const [, cx, cy, rx, ry] = match;
-    const cxf = parseFloat(cx);
-    const cyf = parseFloat(cy);
-    const rxf = parseFloat(rx);
-    const ryf = parseFloat(ry);
-    const segments = Math.max(16, Math.ceil(Math.max(rxf, ryf) * 2));
-    let d = '';
-    for (let i = 0; i <= segments; i++) {
-      const angle = (i / segments) * 2 * Math.PI;
-      const px = cxf + rxf * Math.cos(angle);
-      const py = cyf + ryf * Math.sin(angle);
-      if (i === 0) {
-        d += `M${px},${py}`;
-      } else {
-        d += `L${px},${py}`;
+      case 'rect': {
+        if (attrs.width === undefined || attrs.height === undefined) break;
+        const x = attrs.x === undefined ? 0 : parseLength(attrs.x);
+        const y = attrs.y === undefined ? 0 : parseLength(attrs.y);
+        const w = parseLength(attrs.width);
+        const h = parseLength(attrs.height);
+        // Skip percentage-sized and fill-only rects, e.g. the white
+        // width="100%" background of an empty canvas
+        if (![x, y, w, h].every(Number.isFinite) || isFillOnlyRect(attrs)) break;
+        addSegment([
+          { x, y },
+          { x: x + w, y },
+          { x: x + w, y: y + h },
+          { x, y: y + h },
+          { x, y },
+        ]);
+        break;
       }
+
+      // Circles and ellipses - approximate with polygon
+      case 'circle':
+        if (attrs.r === undefined) break;
+        addSegment(approximateEllipse(num(attrs.cx), num(attrs.cy), num(attrs.r), num(attrs.r)));
+        break;
+
+      case 'ellipse':
+        if (attrs.rx === undefined || attrs.ry === undefined) break;
+        addSegment(approximateEllipse(num(attrs.cx), num(attrs.cy), num(attrs.rx), num(attrs.ry)));
+        break;
     }
-    paths.push(d);
   }
 
-  return paths;
+  return segments;
 }
 
 /**
@@ -716,24 +764,15 @@ export function svgToPlotCommands(
 ): PlotCommand[] {
   const { canvasWidthMm, canvasHeightMm, safetyMarginMm = 3, optimizePaths = true } = options;
 
-  // Extract paths from SVG
-  const pathStrings = extractPathsFromSvg(svgString);
-  if (pathStrings.length === 0) {
+  // Extract drawable elements from SVG as point arrays
+  let segments = extractSegmentsFromSvg(svgString);
+  if (segments.length === 0) {
     return [];
   }
 
   // Get SVG dimensions for scaling
   const svgDims = getSvgDimensions(svgString);
 
-  // Parse paths to point arrays
-  let segments: PathSegment[] = [];
-  for (const pathD of pathStrings) {
-    const points = parsePathD(pathD);
-    if (points.length > 0) {
-      segments.push({ points });
-    }
-  }
-
   // Apply scaling if SVG has different dimensions than canvas
   if (svgDims) {
     const scaleX = canvasWidthMm / svgDims.width;
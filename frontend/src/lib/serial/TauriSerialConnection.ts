@@ -84,6 +84,12 @@ interface QueuedCommand {
   charCount: number;  // Length including newline
 }
 
+// Caller waiting for a streaming acknowledgement
+interface StreamWaiter {
+  resolve: () => void;
+  reject: (err: Error) => void;
+}
+
 // GRBL RX buffer size (128 bytes, but we use 100 for safety margin with CH340 chips)
 const GRBL_RX_BUFFER_SIZE = 100;
 
@@ -142,17 +148,34 @@ export function isTauriEnvironment(): boolean {
   return false;
 }
 
-/**
- * Get the Tauri serial plugin API with enums.
- * Throws if not in Tauri environment.
- */
-async function getTauriSerial(): Promise<{
+/** Tauri serial plugin API with enums */
+interface TauriSerialApi {
   SerialPort: TauriSerialPortConstructor;
   DataBits: any;
   FlowControl: any;
   Parity: any;
   StopBits: any;
-}> {
+}
+
+// Resolved once and shared by every connection and port listing
+let _tauriSerialPromise: Promise<TauriSerialApi> | null = null;
+
+/**
+ * Get the Tauri serial plugin API with enums.
+ * Throws if not in Tauri environment.
+ */
+function getTauriSerial(): Promise<TauriSerialApi> {
+  if (!_tauriSerialPromise) {
+    _tauriSerialPromise = loadTauriSerial().catch((err) => {
+      // Allow a later call to retry
+      _tauriSerialPromise = null;
+      throw err;
+    });
+  }
+  return _tauriSerialPromise;
+}
+
+async function loadTauriSerial(): Promise<TauriSerialApi> {
   if (!isTauriEnvironment()) {
     throw createSerialError(
       'BROWSER_NOT_SUPPORTED',
@@ -194,7 +217,7 @@ export class TauriSerialConnection implements ISerialConnection {
   private _streamingEnabled: boolean = false;
   private _streamQueue: QueuedCommand[] = [];  // Commands sent but not yet acknowledged
   private _streamBufferUsed: number = 0;       // Characters currently in GRBL's RX buffer
-  private _streamWaiters: Array<{ resolve: () => void; reject: (err: Error) => void }> = [];
+  private _streamWaiters = new Set<StreamWaiter>();  // Insertion-ordered, oldest first
   private _streamResponseBuffer: string = '';  // Buffer for streaming responses
 
   get state(): ConnectionState {
@@ -219,54 +242,47 @@ export class TauriSerialConnection implements ISerialConnection {
       const ports = await SerialPort.available_ports_direct();
       console.log('[TauriSerial] Raw ports from Tauri:', Object.keys(ports).length, 'ports');
 
-      const portList = Object.entries(ports).map(([path, info]) => {
-        let isCompatible = false;
-        let deviceName: string | undefined;
+      // Single pass: build port info, count compatible devices, and bucket
+      // macOS cu.* / tty.* paths for the preference check below
+      const portList: SerialPortInfo[] = [];
+      const cuPorts: SerialPortInfo[] = [];
+      let ttyPortCount = 0;
+      let compatibleCount = 0;
 
-        // Enhanced logging for all USB devices
-        console.log('[TauriSerial] Port:', path, {
-          vid: info.vid,
-          pid: info.pid,
-          manufacturer: info.manufacturer,
-          product: info.product,
-          port_type: info.port_type
-        });
+      for (const [path, info] of Object.entries(ports)) {
+        let deviceName: string | undefined;
 
         // Check if this matches a supported device
         if (info.vid !== undefined && info.pid !== undefined) {
-          for (const device of SUPPORTED_DEVICES) {
-            if (info.vid === device.vid && info.pid === device.pid) {
-              isCompatible = true;
-              deviceName = device.name;
-              console.log('[TauriSerial] ✓ Matched device:', device.name, 'at', path);
-              break;
-            }
-          }
-        } else {
+          deviceName = SUPPORTED_DEVICES.find((d) => d.vid === info.vid && d.pid === info.pid)?.name;
+        } else if (path.includes('usb') || path.includes('usbmodem')) {
           // Log ports without VID/PID for debugging
-          if (path.includes('usb') || path.includes('usbmodem')) {
-            console.warn('[TauriSerial] USB port without VID/PID:', path);
-          }
+          console.warn('[TauriSerial] USB port without VID/PID:', path);
         }
 
-        return {
+        const port: SerialPortInfo = {
           path,
           description: info.product || info.manufacturer || info.port_type || 'Unknown Device',
           hwid: info.vid && info.pid ? `VID:${info.vid.toString(16).toUpperCase()} PID:${info.pid.toString(16).toUpperCase()}` : undefined,
-          isCompatible,
+          isCompatible: deviceName !== undefined,
           deviceName,
         };
-      });
+        portList.push(port);
+
+        if (port.isCompatible) compatibleCount++;
+        if (path.includes('/dev/cu.')) {
+          cuPorts.push(port);
+        } else if (path.includes('/dev/tty.')) {
+          ttyPortCount++;
+        }
+      }
 
-      console.log('[TauriSerial] Processed', portList.length, 'ports,', portList.filter(p => p.isCompatible).length, 'compatible');
+      console.log('[TauriSerial] Processed', portList.length, 'ports,', compatibleCount, 'compatible');
 
       // On macOS, prefer /dev/cu.* over /dev/tty.* for outgoing connections
       // Filter to only show cu.* devices if both exist for the same device
-      const cuPorts = portList.filter(p => p.path.includes('/dev/cu.'));
-      const ttyPorts = portList.filter(p => p.path.includes('/dev/tty.'));
-
-      if (cuPorts.length > 0 && ttyPorts.length > 0) {
-        console.log('[TauriSerial] Filtering to prefer', cuPorts.length, 'cu.* ports over', ttyPorts.length, 'tty.* ports on macOS');
+      if (cuPorts.length > 0 && ttyPortCount > 0) {
+        console.log('[TauriSerial] Filtering to prefer', cuPorts.length, 'cu.* ports over', ttyPortCount, 'tty.* ports on macOS');
         return cuPorts;
       }
 
@@ -485,7 +501,7 @@ export class TauriSerialConnection implements ISerialConnection {
       (err as any).code = 'DEVICE_DISCONNECTED';
       waiter.reject(err);
     }
-    this._streamWaiters = [];
+    this._streamWaiters.clear();
     this._streamQueue = [];
     this._streamBufferUsed = 0;
     this._streamingEnabled = false;
@@ -543,8 +559,6 @@ export class TauriSerialConnection implements ISerialConnection {
   }
 
   async sendCommand(command: string, timeout: number = 5000): Promise<string> {
-    console.log('[TauriSerial] sendCommand called:', command, 'timeout:', timeout);
-
     if (!this.isConnected || !this._port) {
       console.error('[TauriSerial] Not connected!');
       throw createSerialError(
@@ -577,8 +591,6 @@ export class TauriSerialConnection implements ISerialConnection {
       cmdToSend = `${command}\r`;
     }
 
-    console.log('[TauriSerial] Will send:', JSON.stringify(cmdToSend));
-
     // Create promise that will be resolved when response is complete
     return new Promise<string>((resolve, reject) => {
       const timeoutId = setTimeout(() => {
@@ -818,20 +830,7 @@ export class TauriSerialConnection implements ISerialConnection {
    */
   private _waitForStreamResponse(): Promise<void> {
     return new Promise((resolve, reject) => {
-      // Set a timeout
-      const timeoutId = setTimeout(() => {
-        const idx = this._streamWaiters.findIndex(w => w.resolve === resolve);
-        if (idx >= 0) {
-          this._streamWaiters.splice(idx, 1);
-        }
-        reject(createSerialError(
-          'RESPONSE_TIMEOUT',
-          'Stream response timeout',
-          'Timeout waiting for GRBL response during streaming'
-        ));
-      }, 10000);
-
-      this._streamWaiters.push({
+      const waiter: StreamWaiter = {
         resolve: () => {
           clearTimeout(timeoutId);
           resolve();
@@ -840,10 +839,33 @@ export class TauriSerialConnection implements ISerialConnection {
           clearTimeout(timeoutId);
           reject(err);
         },
-      });
+      };
+
+      // Set a timeout; drop the waiter so a late 'ok' goes to the next caller
+      const timeoutId = setTimeout(() => {
+        this._streamWaiters.delete(waiter);
+        reject(createSerialError(
+          'RESPONSE_TIMEOUT',
+          'Stream response timeout',
+          'Timeout waiting for GRBL response during streaming'
+        ));
+      }, 10000);
+
+      this._streamWaiters.add(waiter);
     });
   }
 
+  /**
+   * Resolve the oldest streaming waiter, if any.
+   */
+  private _resolveNextStreamWaiter(): void {
+    const next = this._streamWaiters.values().next();
+    if (!next.done) {
+      this._streamWaiters.delete(next.value);
+      next.value.resolve();
+    }
+  }
+
   /**
    * Process streaming response data.
    * Called from _handleIncomingData when in streaming mode.
@@ -870,10 +892,7 @@ export class TauriSerialConnection implements ISerialConnection {
           this._streamBufferUsed -= completed.charCount;
 
           // Notify one waiter
-          if (this._streamWaiters.length > 0) {
-            const waiter = this._streamWaiters.shift()!;
-            waiter.resolve();
-          }
+          this._resolveNextStreamWaiter();
         }
       } else if (lower.startsWith('error:')) {
         // Error response - free buffer space but log warning
@@ -884,10 +903,8 @@ export class TauriSerialConnection implements ISerialConnection {
           console.warn('[TauriSerial] Failed command:', failed.command);
 
           // Still notify waiter (let higher level handle errors)
-          if (this._streamWaiters.length > 0) {
-            const waiter = this._streamWaiters.shift()!;
-            waiter.resolve();  // Resolve, don't reject - error handling is at higher level
-          }
+          // Resolve, don't reject - error handling is at higher level
+          this._resolveNextStreamWaiter();
         }
       } else if (lower.startsWith('alarm:')) {
         // Alarm - reject all waiters
@@ -896,7 +913,7 @@ export class TauriSerialConnection implements ISerialConnection {
         for (const waiter of this._streamWaiters) {
           waiter.reject(err as unknown as Error);
         }
-        this._streamWaiters = [];
+        this._streamWaiters.clear();
         this._streamQueue = [];
         this._streamBufferUsed = 0;
       }
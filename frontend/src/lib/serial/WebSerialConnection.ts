@@ -16,11 +16,21 @@ import {
   ConnectionState,
   SerialConnectionEvents,
   SerialConnectionOptions,
+  SerialError,
   SUPPORTED_DEVICES,
   DEFAULT_SERIAL_OPTIONS,
   createSerialError,
 } from './types';
 
+// Pending command waiting for its response from the read loop
+interface PendingResponse {
+  command: string;
+  isComplete: (response: string) => boolean;
+  resolve: (value: string) => void;
+  reject: (error: SerialError) => void;
+  timeoutId: ReturnType<typeof setTimeout>;
+}
+
 /** Check if Web Serial API is available */
 export function isWebSerialSupported(): boolean {
   return typeof navigator !== 'undefined' && 'serial' in navigator;
@@ -42,6 +52,7 @@ export class WebSerialConnection implements ISerialConnection {
   private _eventHandlers: SerialConnectionEvents = {};
   private _readBuffer: string = '';
   private _readLoopActive: boolean = false;
+  private _pendingResponse: PendingResponse | null = null;
 
   // Encoder/decoder for text conversion
   private readonly _encoder = new TextEncoder();
@@ -257,6 +268,7 @@ export class WebSerialConnection implements ISerialConnection {
 
   async disconnect(): Promise<void> {
     this._readLoopActive = false;
+    this._rejectPendingResponse();
 
     try {
       if (this._reader) {
@@ -299,6 +311,19 @@ export class WebSerialConnection implements ISerialConnection {
     const isGrblRealtime = ['?', '!', '~', '\x18'].includes(command);
     const isGrblCommand = command.startsWith('$') || command.startsWith('G') || command.startsWith('M') || isGrblRealtime;
 
+    // Only one response can be awaited at a time; a caller still waiting
+    // would otherwise be left to time out once the buffer is cleared
+    if (this._pendingResponse) {
+      this._rejectPendingResponse(
+        createSerialError(
+          'COMMAND_REJECTED',
+          'Command superseded',
+          `Command '${this._pendingResponse.command}' was superseded by '${command}' before its response arrived.`,
+          { command: this._pendingResponse.command, nextCommand: command }
+        )
+      );
+    }
+
     // Clear read buffer
     this._readBuffer = '';
 
@@ -314,42 +339,50 @@ export class WebSerialConnection implements ISerialConnection {
 
     await this._writer.write(cmdBytes);
 
-    // Wait for response
-    const startTime = Date.now();
-    while (true) {
-      const response = this._readBuffer.trim();
-
-      // Check for complete response based on protocol
-      if (isGrblStatusQuery) {
-        if (response.endsWith('>')) {
-          return response;
+    // Wait for the read loop to deliver a complete response
+    return new Promise<string>((resolve, reject) => {
+      const isComplete = (response: string): boolean => {
+        // Check for complete response based on protocol
+        if (isGrblStatusQuery) {
+          return response.endsWith('>');
         }
-      } else if (isGrblCommand) {
-        if (response.toLowerCase().includes('ok') ||
-            response.toLowerCase().includes('error:') ||
-            response.toLowerCase().includes('alarm:')) {
-          return response;
+        if (isGrblCommand) {
+          const lower = response.toLowerCase();
+          return lower.includes('ok') || lower.includes('error:') || lower.includes('alarm:');
         }
-      } else {
         // EBB legacy response
-        if (response.endsWith('\r\n') || response.includes('OK')) {
-          return response;
-        }
-      }
+        return response.endsWith('\r\n') || response.includes('OK');
+      };
 
-      // Check timeout
-      if (Date.now() - startTime > timeout) {
-        throw createSerialError(
-          'RESPONSE_TIMEOUT',
-          'Response timeout',
-          `No response received within ${timeout}ms`,
-          { command, partialResponse: response }
-        );
+      // The response may already have arrived while the write was awaited
+      const response = this._readBuffer.trim();
+      if (isComplete(response)) {
+        resolve(response);
+        return;
       }
 
-      // Small delay before checking again
-      await new Promise((resolve) => setTimeout(resolve, 10));
-    }
+      const pending: PendingResponse = {
+        command,
+        isComplete,
+        resolve,
+        reject,
+        timeoutId: setTimeout(() => {
+          if (this._pendingResponse === pending) {
+            this._pendingResponse = null;
+          }
+          reject(
+            createSerialError(
+              'RESPONSE_TIMEOUT',
+              'Response timeout',
+              `No response received within ${timeout}ms`,
+              { command, partialResponse: this._readBuffer.trim() }
+            )
+          );
+        }, timeout),
+      };
+
+      this._pendingResponse = pending;
+    });
   }
 
   async sendCommandNoResponse(command: string): Promise<void> {
@@ -421,6 +454,7 @@ export class WebSerialConnection implements ISerialConnection {
           const text = this._decoder.decode(value);
           this._readBuffer += text;
           this._eventHandlers.onData?.(text);
+          this._checkPendingResponse();
         }
       }
     } catch (err) {
@@ -432,6 +466,39 @@ export class WebSerialConnection implements ISerialConnection {
     }
   }
 
+  /**
+   * Resolve the pending command if the read buffer now holds its response.
+   */
+  private _checkPendingResponse(): void {
+    if (!this._pendingResponse) return;
+
+    const response = this._readBuffer.trim();
+    if (this._pendingResponse.isComplete(response)) {
+      clearTimeout(this._pendingResponse.timeoutId);
+      const pendingResolve = this._pendingResponse.resolve;
+      this._pendingResponse = null;
+      pendingResolve(response);
+    }
+  }
+
+  /**
+   * Fail the pending command, if any. Defaults to a disconnect error.
+   */
+  private _rejectPendingResponse(
+    error: SerialError = createSerialError(
+      'DEVICE_DISCONNECTED',
+      'Not connected',
+      'Connection closed while waiting for response.'
+    )
+  ): void {
+    if (!this._pendingResponse) return;
+
+    clearTimeout(this._pendingResponse.timeoutId);
+    const pendingReject = this._pendingResponse.reject;
+    this._pendingResponse = null;
+    pendingReject(error);
+  }
+
   private async _verifyConnection(): Promise<boolean> {
     try {
       // Try GRBL identification first
@@ -458,6 +525,7 @@ export class WebSerialConnection implements ISerialConnection {
   private _handleDisconnect(): void {
     this._state = 'disconnected';
     this._readLoopActive = false;
+    this._rejectPendingResponse();
     this._port = null;
     this._reader = null;
     this._writer = null;
@@ -1,4 +1,4 @@
-import { useEffect, useState, useCallback } from 'react';
+import { useEffect, useState, useCallback, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { ArrowLeft, Play, Pause, Square, Check, RotateCcw, Mail, Home, AlertCircle } from 'lucide-react';
 import { useProjectStore } from '../stores/projectStore';
@@ -8,9 +8,48 @@ import { WorkflowStepper } from '../components/workflow/WorkflowStepper';
 import { PlotProgress } from '../components/workflow/PlotProgress';
 import { PlotterControls } from '../components/workflow/PlotterControls';
 import { svgToPlotCommands } from '../lib/plotter';
+import type { PlotCommand } from '../lib/plotter';
 import { exportCanvasSvg } from '../lib/canvas/fabricToSvg';
 import * as projectDB from '../services/projectDB';
 import { PAPER_DIMENSIONS } from '../types';
+import type { CanvasSide, WorkflowStep } from '../types';
+
+// Step transitions keyed by the current step
+const PLOTTING_STEP_FOR_PREVIEW: Partial<Record<WorkflowStep, WorkflowStep>> = {
+  preview_side1: 'plotting_side1',
+  preview_side2: 'plotting_side2',
+  preview_envelope: 'plotting_envelope',
+};
+
+const PREVIEW_STEP_FOR_PLOTTING: Partial<Record<WorkflowStep, WorkflowStep>> = {
+  plotting_side1: 'preview_side1',
+  plotting_side2: 'preview_side2',
+  plotting_envelope: 'preview_envelope',
+};
+
+const CONFIRM_STEP_FOR_PLOTTING: Partial<Record<WorkflowStep, WorkflowStep>> = {
+  plotting_side1: 'confirm_side1',
+  plotting_side2: 'confirm_side2',
+  plotting_envelope: 'confirm_envelope',
+};
+
+// Canvas side plotted at each workflow step
+const SIDE_FOR_STEP: Record<WorkflowStep, CanvasSide> = {
+  idle: 'front',
+  editing: 'front',
+  preview_side1: 'front',
+  plotting_side1: 'front',
+  confirm_side1: 'front',
+  flip_paper: 'back',
+  preview_side2: 'back',
+  plotting_side2: 'back',
+  confirm_side2: 'back',
+  insert_envelope: 'envelope',
+  preview_envelope: 'envelope',
+  plotting_envelope: 'envelope',
+  confirm_envelope: 'envelope',
+  completed: 'envelope',
+};
 
 export function PlotPage() {
   const { projectId } = useParams<{ projectId: string }>();
@@ -33,6 +72,8 @@ export function PlotPage() {
   const [warnings, setWarnings] = useState<string[]>([]);
   const [isLoadingSvg, setIsLoadingSvg] = useState(false);
   const [isStartingPlot, setIsStartingPlot] = useState(false);
+  // Plot commands parsed ahead of time for the SVG currently previewed
+  const preparedCommandsRef = useRef<{ svg: string; commands: PlotCommand[] } | null>(null);
 
   useEffect(() => {
     if (projectId) {
@@ -65,24 +106,30 @@ export function PlotPage() {
       ? plotProgress.state
       : (plotProgress as unknown as { status?: string }).status;
 
-    if (progressState === 'completed' && currentStep.includes('plotting')) {
+    const confirmStep = CONFIRM_STEP_FOR_PLOTTING[currentStep];
+    if (progressState === 'completed' && confirmStep) {
       // Move to confirm step
-      if (currentStep === 'plotting_side1') setStep('confirm_side1');
-      else if (currentStep === 'plotting_side2') setStep('confirm_side2');
-      else if (currentStep === 'plotting_envelope') setStep('confirm_envelope');
+      setStep(confirmStep);
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [plotProgress, currentStep]);
 
-  const getCurrentSide = useCallback((): 'front' | 'back' | 'envelope' => {
-    if (currentStep.includes('side1') || currentStep === 'editing' || currentStep === 'idle') {
-      return 'front';
-    }
-    if (currentStep.includes('side2') || currentStep === 'flip_paper') {
-      return 'back';
-    }
-    return 'envelope';
-  }, [currentStep]);
+  const getCurrentSide = useCallback((): CanvasSide => SIDE_FOR_STEP[currentStep], [currentStep]);
+
+  // Depend on the dimensions only, so unrelated project updates (e.g. a
+  // rename or save timestamp) don't recreate the callback.
+  const canvasWidthMm = currentProject?.width_mm;
+  const canvasHeightMm = currentProject?.height_mm;
+
+  const buildPlotCommands = useCallback((svg: string): PlotCommand[] => {
+    if (canvasWidthMm === undefined || canvasHeightMm === undefined) return [];
+    return svgToPlotCommands(svg, {
+      canvasWidthMm,
+      canvasHeightMm,
+      safetyMarginMm: 3,
+      optimizePaths: true,
+    });
+  }, [canvasWidthMm, canvasHeightMm]);
 
   const loadSvgPreview = useCallback(async () => {
     if (!projectId || !currentProject) return;
@@ -91,7 +138,7 @@ export function PlotPage() {
       const side = getCurrentSide();
 
       // Get canvas data from IndexedDB
-      const canvasJson = await projectDB.getCanvas(projectId, side as 'front' | 'back');
+      const canvasJson = await projectDB.getCanvas(projectId, side);
 
       // Get paper dimensions
       const paperSize = currentProject.paper_size;
@@ -107,13 +154,26 @@ export function PlotPage() {
       const response = await exportCanvasSvg(canvasJson, widthMm, heightMm);
       setSvgPreview(response.svg);
       setWarnings(response.warnings);
+
+      // Parse the plot commands while the user reviews the preview, so
+      // starting the plot doesn't have to wait for it. Deferred so the
+      // preview renders first.
+      const svg = response.svg;
+      preparedCommandsRef.current = null;
+      setTimeout(() => {
+        try {
+          preparedCommandsRef.current = { svg, commands: buildPlotCommands(svg) };
+        } catch (err) {
+          console.warn('Failed to prepare plot commands:', err);
+        }
+      }, 0);
     } catch (err) {
       console.error('Failed to load SVG preview:', err);
       setWarnings(['Failed to generate SVG preview']);
     } finally {
       setIsLoadingSvg(false);
     }
-  }, [projectId, currentProject, getCurrentSide]);
+  }, [projectId, currentProject, getCurrentSide, buildPlotCommands]);
 
   // Load SVG preview when entering preview step
   useEffect(() => {
@@ -139,13 +199,12 @@ export function PlotPage() {
     try {
       const side = getCurrentSide();
 
-      // Convert SVG to plot commands using the new TypeScript layer
-      const commands = svgToPlotCommands(svgPreview, {
-        canvasWidthMm: currentProject.width_mm,
-        canvasHeightMm: currentProject.height_mm,
-        safetyMarginMm: 3,
-        optimizePaths: true,
-      });
+      // Convert SVG to plot commands using the new TypeScript layer,
+      // reusing the commands prepared during preview when available
+      const prepared = preparedCommandsRef.current;
+      const commands = prepared && prepared.svg === svgPreview
+        ? prepared.commands
+        : buildPlotCommands(svgPreview);
 
       if (commands.length === 0) {
         console.warn('No plottable content found in SVG');
@@ -154,19 +213,17 @@ export function PlotPage() {
       }
 
       // Update workflow step
-      if (currentStep === 'preview_side1') setStep('plotting_side1');
-      else if (currentStep === 'preview_side2') setStep('plotting_side2');
-      else if (currentStep === 'preview_envelope') setStep('plotting_envelope');
+      const plottingStep = PLOTTING_STEP_FOR_PREVIEW[currentStep];
+      if (plottingStep) setStep(plottingStep);
 
       // Start plotting with the commands
       await startPlot(commands, side);
       if (projectId) saveWorkflow(projectId);
     } catch (err) {
       console.error('Failed to start plot:', err);
-      // Revert to preview step on error
-      if (currentStep === 'plotting_side1') setStep('preview_side1');
-      else if (currentStep === 'plotting_side2') setStep('preview_side2');
-      else if (currentStep === 'plotting_envelope') setStep('preview_envelope');
+      // Revert to preview step on error (currentStep is still the preview
+      // step this handler was invoked from)
+      setStep(currentStep);
     } finally {
       setIsStartingPlot(false);
     }
@@ -183,9 +240,8 @@ export function PlotPage() {
   const handleCancel = () => {
     cancelPlot();
     // Go back to preview
-    if (currentStep === 'plotting_side1') setStep('preview_side1');
-    else if (currentStep === 'plotting_side2') setStep('preview_side2');
-    else if (currentStep === 'plotting_envelope') setStep('preview_envelope');
+    const previewStep = PREVIEW_STEP_FOR_PLOTTING[currentStep];
+    if (previewStep) setStep(previewStep);
     if (projectId) saveWorkflow(projectId);
   };
 
@@ -2,7 +2,7 @@ import { openDB, IDBPDatabase } from 'idb';
 import type { GalleryImage } from '../types';
 
 const DB_NAME = 'zagreb-image-gallery';
-const DB_VERSION = 1;
+const DB_VERSION = 2;
 const STORE_NAME = 'images';
 
 let dbInstance: IDBPDatabase | null = null;
@@ -16,7 +16,7 @@ export async function getDB(): Promise<IDBPDatabase> {
   }
 
   dbInstance = await openDB(DB_NAME, DB_VERSION, {
-    upgrade(db) {
+    upgrade(db, _oldVersion, _newVersion, transaction) {
       // Create object store if it doesn't exist
       if (!db.objectStoreNames.contains(STORE_NAME)) {
         const store = db.createObjectStore(STORE_NAME, { keyPath: 'id' });
@@ -24,6 +24,12 @@ export async function getDB(): Promise<IDBPDatabase> {
         // Create index for sorting by date
         store.createIndex('by-date', 'createdAt', { unique: false });
       }
+
+      // Create index for finding duplicate images by content
+      const store = transaction.objectStore(STORE_NAME);
+      if (!store.indexNames.contains('by-hash')) {
+        store.createIndex('by-hash', 'contentHash', { unique: false });
+      }
     },
   });
 
@@ -46,6 +52,14 @@ export async function getImage(id: string): Promise<GalleryImage | undefined> {
   return db.get(STORE_NAME, id);
 }
 
+/**
+ * Find an image with the given content hash
+ */
+export async function getImageByHash(contentHash: string): Promise<GalleryImage | undefined> {
+  const db = await getDB();
+  return db.getFromIndex(STORE_NAME, 'by-hash', contentHash);
+}
+
 /**
  * Delete an image by ID
  */
@@ -62,11 +76,9 @@ export async function getAllImages(): Promise<GalleryImage[]> {
   const tx = db.transaction(STORE_NAME, 'readonly');
   const index = tx.store.index('by-date');
 
-  // Get all images sorted by date descending
+  // The index already yields images in ascending date order, so reversing
+  // gives newest first without a comparison sort
   const images = await index.getAll();
 
-  // Sort in descending order (newest first)
-  images.sort((a, b) => b.createdAt - a.createdAt);
-
-  return images;
+  return images.reverse();
 }
@@ -1,12 +1,15 @@
 import { openDB, IDBPDatabase } from 'idb';
-import type { Project, ProjectCreate } from '../types';
+import type { CanvasSide, Project, ProjectCreate } from '../types';
 import { PAPER_DIMENSIONS } from '../types';
 
 const DB_NAME = 'zagreb-projects';
-const DB_VERSION = 1;
+const DB_VERSION = 2;
 const STORE_NAME = 'projects';
 const CANVAS_STORE_NAME = 'canvas';
 
+// Shape of IDs produced by generateId()
+const PROJECT_ID_PATTERN = /^proj_\d+_[a-z0-9]*$/;
+
 let dbInstance: IDBPDatabase | null = null;
 
 /**
@@ -18,7 +21,7 @@ export async function getDB(): Promise<IDBPDatabase> {
   }
 
   dbInstance = await openDB(DB_NAME, DB_VERSION, {
-    upgrade(db) {
+    upgrade(db, _oldVersion, _newVersion, transaction) {
       // Create projects store if it doesn't exist
       if (!db.objectStoreNames.contains(STORE_NAME)) {
         const store = db.createObjectStore(STORE_NAME, { keyPath: 'id' });
@@ -29,6 +32,12 @@ export async function getDB(): Promise<IDBPDatabase> {
       if (!db.objectStoreNames.contains(CANVAS_STORE_NAME)) {
         db.createObjectStore(CANVAS_STORE_NAME, { keyPath: 'id' });
       }
+
+      // Index canvases by project so deletion can find every side directly
+      const canvasStore = transaction.objectStore(CANVAS_STORE_NAME);
+      if (!canvasStore.indexNames.contains('by-project')) {
+        canvasStore.createIndex('by-project', 'projectId', { unique: false });
+      }
     },
   });
 
@@ -39,7 +48,14 @@ export async function getDB(): Promise<IDBPDatabase> {
  * Generate a unique ID for a project
  */
 function generateId(): string {
-  return `proj_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+  return `proj_${Date.now()}_${Math.random().toString(36).slice(2, 11)}`;
+}
+
+/**
+ * Check that an ID (e.g. from a route param) looks like a project ID
+ */
+export function isValidProjectId(id: string): boolean {
+  return PROJECT_ID_PATTERN.test(id);
 }
 
 /**
@@ -61,6 +77,7 @@ export async function createProject(data: ProjectCreate): Promise<Project> {
     height_mm = dimensions.height;
   }
 
+  const now = new Date().toISOString();
   const project: Project = {
     id: generateId(),
     name: data.name,
@@ -72,8 +89,8 @@ export async function createProject(data: ProjectCreate): Promise<Project> {
     is_double_sided: data.is_double_sided || false,
     include_envelope: data.include_envelope || false,
     envelope_address: data.envelope_address,
-    created_at: new Date().toISOString(),
-    updated_at: new Date().toISOString(),
+    created_at: now,
+    updated_at: now,
   };
 
   await db.put(STORE_NAME, project);
@@ -88,20 +105,23 @@ export async function getAllProjects(): Promise<Project[]> {
   const tx = db.transaction(STORE_NAME, 'readonly');
   const index = tx.store.index('by-date');
 
+  // ISO timestamps sort chronologically, so the index is already in
+  // ascending date order; reverse for newest first instead of re-parsing
+  // every date inside a comparison sort
   const projects = await index.getAll();
 
-  // Sort in descending order (newest first)
-  projects.sort((a, b) =>
-    new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
-  );
-
-  return projects;
+  return projects.reverse();
 }
 
 /**
  * Get a single project by ID
  */
 export async function getProject(id: string): Promise<Project | undefined> {
+  // Reject malformed IDs before opening a transaction
+  if (!isValidProjectId(id)) {
+    return undefined;
+  }
+
   const db = await getDB();
   return db.get(STORE_NAME, id);
 }
@@ -133,13 +153,17 @@ export async function updateProject(id: string, data: Partial<Project>): Promise
  */
 export async function deleteProject(id: string): Promise<void> {
   const db = await getDB();
+  const tx = db.transaction([STORE_NAME, CANVAS_STORE_NAME], 'readwrite');
+  const canvasStore = tx.objectStore(CANVAS_STORE_NAME);
 
-  // Delete project from projects store
-  await db.delete(STORE_NAME, id);
+  // Delete associated canvas data for every side (front, back, envelope)
+  const canvasIds = await canvasStore.index('by-project').getAllKeys(id);
 
-  // Delete associated canvas data
-  await db.delete(CANVAS_STORE_NAME, `${id}_front`);
-  await db.delete(CANVAS_STORE_NAME, `${id}_back`);
+  await Promise.all([
+    tx.objectStore(STORE_NAME).delete(id),
+    ...canvasIds.map((canvasId) => canvasStore.delete(canvasId)),
+    tx.done,
+  ]);
 }
 
 /**
@@ -148,7 +172,7 @@ export async function deleteProject(id: string): Promise<void> {
 export async function saveCanvas(
   projectId: string,
   canvasJson: Record<string, unknown>,
-  side: 'front' | 'back' = 'front'
+  side: CanvasSide = 'front'
 ): Promise<void> {
   const db = await getDB();
   const id = `${projectId}_${side}`;
@@ -167,7 +191,7 @@ export async function saveCanvas(
  */
 export async function getCanvas(
   projectId: string,
-  side: 'front' | 'back' = 'front'
+  side: CanvasSide = 'front'
 ): Promise<Record<string, unknown> | null> {
   const db = await getDB();
   const id = `${projectId}_${side}`;
@@ -39,6 +39,24 @@ let saveQueue: SaveQueueItem[] = [];
 let isProcessingSave = false;
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 1000;
+const SAVED_RESET_DELAY_MS = 2000;
+
+// Single pending timer that returns the 'saved' indicator to 'idle'
+let savedResetTimer: ReturnType<typeof setTimeout> | null = null;
+
+// Schedule the 'saved' -> 'idle' reset once per burst of saves
+function scheduleSavedReset(getState: () => CanvasState, setState: (partial: Partial<CanvasState>) => void) {
+  if (savedResetTimer) {
+    clearTimeout(savedResetTimer);
+  }
+
+  savedResetTimer = setTimeout(() => {
+    savedResetTimer = null;
+    if (getState().saveState === 'saved') {
+      setState({ saveState: 'idle' });
+    }
+  }, SAVED_RESET_DELAY_MS);
+}
 
 // Process save queue with single-flight guarantee
 async function processSaveQueue(getState: () => CanvasState, setState: (partial: Partial<CanvasState>) => void) {
@@ -64,7 +82,7 @@ async function processSaveQueue(getState: () => CanvasState, setState: (partial:
   for (const [_, item] of Array.from(uniqueSaves.entries())) {
     try {
       // Use IndexedDB instead of API
-      await projectDB.saveCanvas(item.projectId, item.canvasJson, item.side as 'front' | 'back');
+      await projectDB.saveCanvas(item.projectId, item.canvasJson, item.side);
 
       // Update state on successful save
       setState({
@@ -80,11 +98,7 @@ async function processSaveQueue(getState: () => CanvasState, setState: (partial:
       console.log(`Successfully saved canvas for project ${item.projectId}, side ${item.side}`);
 
       // Reset to idle after a brief delay
-      setTimeout(() => {
-        if (getState().saveState === 'saved') {
-          setState({ saveState: 'idle' });
-        }
-      }, 2000);
+      scheduleSavedReset(getState, setState);
 
     } catch (err: any) {
       console.error('Canvas save error:', err);
@@ -137,7 +151,7 @@ export const useCanvasStore = create<CanvasState>((set, get) => ({
     set({ isLoading: true, error: null });
     try {
       // Use IndexedDB instead of API
-      const data = await projectDB.getCanvas(projectId, side as 'front' | 'back');
+      const data = await projectDB.getCanvas(projectId, side);
       set((state) => ({
         canvasData: { ...state.canvasData, [side]: data },
         isLoading: false,
@@ -1,96 +1,74 @@
 import { create } from 'zustand';
 import type { GalleryImage } from '../types';
 import * as imageGalleryDB from '../services/imageGalleryDB';
+import { sha256Hex } from '../utils/hash';
+
+// Thumbnails are flattened onto white, so lossy JPEG is safe and much
+// cheaper to encode (and store) than PNG
+const THUMBNAIL_JPEG_QUALITY = 0.85;
 
 // Helper function to generate a UUID
 function generateId(): string {
   return crypto.randomUUID();
 }
 
-// Helper function to convert data URL to Blob
-function dataURLtoBlob(dataURL: string): Blob {
-  const arr = dataURL.split(',');
-  const mimeMatch = arr[0].match(/:(.*?);/);
-  const mime = mimeMatch ? mimeMatch[1] : 'image/png';
-  const bstr = atob(arr[1]);
-  let n = bstr.length;
-  const u8arr = new Uint8Array(n);
-  while (n--) {
-    u8arr[n] = bstr.charCodeAt(n);
-  }
-  return new Blob([u8arr], { type: mime });
+// Helper function to convert data URL to Blob. Letting fetch() decode the
+// data URL keeps the base64 decode off the main thread instead of copying
+// it byte by byte in JavaScript.
+async function dataURLtoBlob(dataURL: string): Promise<Blob> {
+  const response = await fetch(dataURL);
+  return response.blob();
 }
 
-// Helper function to generate a 150x150 thumbnail from an image
-async function generateThumbnail(
-  imageDataUrl: string,
-  size: number = 150
-): Promise<string> {
-  return new Promise((resolve, reject) => {
-    const img = new Image();
-    img.onload = () => {
-      const canvas = document.createElement('canvas');
-      const ctx = canvas.getContext('2d');
-
-      if (!ctx) {
-        reject(new Error('Failed to get canvas context'));
-        return;
-      }
+// Scratch canvas reused for every thumbnail instead of allocating a new
+// canvas (and its backing store) per image
+let thumbnailCanvas: HTMLCanvasElement | null = null;
 
-      // Calculate dimensions to maintain aspect ratio
-      let width = img.width;
-      let height = img.height;
-
-      if (width > height) {
-        if (width > size) {
-          height = (height * size) / width;
-          width = size;
-        }
-      } else {
-        if (height > size) {
-          width = (width * size) / height;
-          height = size;
-        }
-      }
+// Helper function to generate a 150x150 thumbnail from a decoded image
+function generateThumbnail(
+  bitmap: ImageBitmap,
+  size: number = 150
+): string {
+  if (!thumbnailCanvas) {
+    thumbnailCanvas = document.createElement('canvas');
+  }
+  const canvas = thumbnailCanvas;
+  const ctx = canvas.getContext('2d');
 
-      canvas.width = size;
-      canvas.height = size;
+  if (!ctx) {
+    throw new Error('Failed to get canvas context');
+  }
 
-      // Fill with white background
-      ctx.fillStyle = '#ffffff';
-      ctx.fillRect(0, 0, size, size);
+  // Calculate dimensions to maintain aspect ratio
+  let width = bitmap.width;
+  let height = bitmap.height;
 
-      // Center the image
-      const x = (size - width) / 2;
-      const y = (size - height) / 2;
+  if (width > height) {
+    if (width > size) {
+      height = (height * size) / width;
+      width = size;
+    }
+  } else {
+    if (height > size) {
+      width = (width * size) / height;
+      height = size;
+    }
+  }
 
-      ctx.drawImage(img, x, y, width, height);
+  canvas.width = size;
+  canvas.height = size;
 
-      resolve(canvas.toDataURL('image/png'));
-    };
+  // Fill with white background
+  ctx.fillStyle = '#ffffff';
+  ctx.fillRect(0, 0, size, size);
 
-    img.onerror = () => {
-      reject(new Error('Failed to load image'));
-    };
+  // Center the image
+  const x = (size - width) / 2;
+  const y = (size - height) / 2;
 
-    img.src = imageDataUrl;
-  });
-}
+  ctx.drawImage(bitmap, x, y, width, height);
 
-// Helper function to get image dimensions
-async function getImageDimensions(
-  dataUrl: string
-): Promise<{ width: number; height: number }> {
-  return new Promise((resolve, reject) => {
-    const img = new Image();
-    img.onload = () => {
-      resolve({ width: img.width, height: img.height });
-    };
-    img.onerror = () => {
-      reject(new Error('Failed to load image'));
-    };
-    img.src = dataUrl;
-  });
+  return canvas.toDataURL('image/jpeg', THUMBNAIL_JPEG_QUALITY);
 }
 
 interface ImageGalleryState {
@@ -143,19 +121,43 @@ export const useImageGalleryStore = create<ImageGalleryState>((set, get) => ({
     set({ isLoading: true, error: null });
 
     try {
-      // Get image dimensions
-      const { width, height } = await getImageDimensions(imageDataUrl);
+      // Convert data URL to blob once and decode the image from it, so the
+      // dimensions and thumbnail share a single decode of the pixel data
+      const blob = await dataURLtoBlob(imageDataUrl);
+
+      // Reuse an existing entry when the same image bytes were added before
+      const contentHash = await sha256Hex(await blob.arrayBuffer());
+      const existing = await imageGalleryDB.getImageByHash(contentHash);
+      if (existing) {
+        set((state) => ({
+          images: state.images.some((img) => img.id === existing.id)
+            ? state.images
+            : [existing, ...state.images],
+          isLoading: false,
+        }));
+        return existing;
+      }
 
-      // Generate thumbnail
-      const thumbnailDataUrl = await generateThumbnail(imageDataUrl);
+      let bitmap: ImageBitmap;
+      try {
+        bitmap = await createImageBitmap(blob);
+      } catch {
+        throw new Error('Failed to load image');
+      }
 
-      // Convert data URL to blob
-      const blob = dataURLtoBlob(imageDataUrl);
+      const { width, height } = bitmap;
+      let thumbnailDataUrl: string;
+      try {
+        thumbnailDataUrl = generateThumbnail(bitmap);
+      } finally {
+        bitmap.close();
+      }
 
       // Create the gallery image object
       const galleryImage: GalleryImage = {
         id: generateId(),
         blob,
+        contentHash,
         thumbnailDataUrl,
         source,
         createdAt: Date.now(),
@@ -169,13 +171,19 @@ export const useImageGalleryStore = create<ImageGalleryState>((set, get) => ({
       // Save to IndexedDB
       await imageGalleryDB.saveImage(galleryImage);
 
+      // Keep the blob handed back by IndexedDB rather than the one decoded
+      // from the data URL: the stored copy is backed by the browser's blob
+      // storage, so the in-memory cache no longer pins every image's bytes
+      const stored = await imageGalleryDB.getImage(galleryImage.id);
+      const cachedImage = stored ?? galleryImage;
+
       // Update in-memory cache
       set((state) => ({
-        images: [galleryImage, ...state.images],
+        images: [cachedImage, ...state.images],
         isLoading: false,
       }));
 
-      return galleryImage;
+      return cachedImage;
     } catch (error) {
       const errorMessage =
         error instanceof Error ? error.message : 'Failed to add image';
@@ -128,6 +128,7 @@ export type CanvasSide = 'front' | 'back' | 'envelope';
 export interface GalleryImage {
   id: string;                    // UUID
   blob: Blob;                    // Full image as PNG blob
+  contentHash?: string;          // SHA-256 of the blob bytes (used to dedupe)
   thumbnailDataUrl: string;      // Base64 thumbnail (150x150)
   source: 'gemini' | 'upload' | 'processed';
   createdAt: number;             // Unix timestamp
@@ -0,0 +1,19 @@
+/**
+ * Content hashing utilities
+ *
+ * Uses the browser's native Web Crypto digest, which runs outside the
+ * JavaScript main thread.
+ */
+
+/**
+ * Compute the SHA-256 digest of binary data as a lowercase hex string
+ */
+export async function sha256Hex(data: BufferSource): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', data);
+  const bytes = new Uint8Array(digest);
+  let hex = '';
+  for (let i = 0; i < bytes.length; i++) {
+    hex += bytes[i].toString(16).padStart(2, '0');
+  }
+  return hex;
+}
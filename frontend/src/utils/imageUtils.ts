@@ -2,105 +2,144 @@
  * Image utilities for format detection and validation
  */
 
+// Bytes needed by sniffImageFormat
+const MAGIC_HEADER_BYTES = 12;
+
+// Leading bytes searched for an <svg tag (room for an XML prolog/comments)
+const SVG_SNIFF_BYTES = 200;
+
+// Formats the browser can draw on a canvas directly
+const CANVAS_COMPATIBLE_FORMATS: ReadonlySet<string> = new Set(['PNG', 'JPEG', 'JPG', 'WEBP', 'GIF', 'SVG']);
+
+// Formats converted to PNG before use
+const CONVERSION_REQUIRED_FORMATS: ReadonlySet<string> = new Set(['HEIC', 'HEIF', 'SVG']);
+
+// MIME type for each format name (JPG is an alias, not image/jpg)
+const FORMAT_MIME_TYPES: Record<string, string> = {
+  PNG: 'image/png',
+  JPEG: 'image/jpeg',
+  JPG: 'image/jpeg',
+  WEBP: 'image/webp',
+  GIF: 'image/gif',
+  SVG: 'image/svg+xml',
+  HEIC: 'image/heic',
+  HEIF: 'image/heif',
+};
+
+// browserSupportsFormat results; support can't change during a session
+const browserFormatSupport = new Map<string, boolean>();
+
+/**
+ * Identify a raster image format from its leading bytes (magic numbers).
+ * Only the first 12 bytes are inspected; returns null when nothing matches.
+ */
+export const sniffImageFormat = (head: Uint8Array): string | null => {
+  // PNG signature: 89 50 4E 47 0D 0A 1A 0A
+  if (
+    head[0] === 0x89 &&
+    head[1] === 0x50 &&
+    head[2] === 0x4e &&
+    head[3] === 0x47 &&
+    head[4] === 0x0d &&
+    head[5] === 0x0a &&
+    head[6] === 0x1a &&
+    head[7] === 0x0a
+  ) {
+    return 'PNG';
+  }
+
+  // JPEG signature: FF D8
+  if (head[0] === 0xff && head[1] === 0xd8) {
+    return 'JPEG';
+  }
+
+  // GIF signature: 47 49 46
+  if (head[0] === 0x47 && head[1] === 0x49 && head[2] === 0x46) {
+    return 'GIF';
+  }
+
+  // WebP signature: RIFF....WEBP
+  if (
+    head[0] === 0x52 &&
+    head[1] === 0x49 &&
+    head[2] === 0x46 &&
+    head[3] === 0x46 &&
+    head[8] === 0x57 &&
+    head[9] === 0x45 &&
+    head[10] === 0x42 &&
+    head[11] === 0x50
+  ) {
+    return 'WEBP';
+  }
+
+  // HEIC/HEIF signature: ftyp at offset 4
+  if (head[4] === 0x66 && head[5] === 0x74 && head[6] === 0x79 && head[7] === 0x70) {
+    const brand = String.fromCharCode(head[8], head[9], head[10], head[11]);
+    if (['heic', 'heix', 'hevc', 'hevx', 'mif1', 'msf1'].includes(brand)) {
+      return 'HEIC';
+    }
+  }
+
+  return null;
+};
+
+/**
+ * Check whether the bytes contain an `<svg` tag (ASCII, case-insensitive)
+ * without decoding them to a string.
+ */
+const containsSvgTag = (bytes: Uint8Array): boolean => {
+  for (let i = 0; i + 3 < bytes.length; i++) {
+    // '<' then 's', 'v', 'g'; OR-ing 0x20 folds ASCII upper case to lower
+    if (
+      bytes[i] === 0x3c &&
+      (bytes[i + 1] | 0x20) === 0x73 &&
+      (bytes[i + 2] | 0x20) === 0x76 &&
+      (bytes[i + 3] | 0x20) === 0x67
+    ) {
+      return true;
+    }
+  }
+  return false;
+};
+
 /**
  * Detect image format from file signature (magic bytes)
+ *
+ * Reads only the 12-byte header for raster formats; the larger SVG window
+ * is read only when no magic number matches.
  */
 export const detectImageFormat = async (file: File): Promise<string> => {
-  return new Promise((resolve, reject) => {
-    const reader = new FileReader();
+  const head = new Uint8Array(await file.slice(0, MAGIC_HEADER_BYTES).arrayBuffer());
 
-    reader.onload = (e) => {
-      const arr = new Uint8Array(e.target?.result as ArrayBuffer);
-
-      // SVG signature: Check for XML/SVG tags (check first 200 bytes)
-      try {
-        const decoder = new TextDecoder('utf-8');
-        const text = decoder.decode(arr).toLowerCase();
-        if (text.includes('<svg') || (text.includes('<?xml') && text.includes('<svg'))) {
-          resolve('SVG');
-          return;
-        }
-      } catch (e) {
-        // Not text, continue with binary checks
-      }
-
-      // PNG signature: 89 50 4E 47 0D 0A 1A 0A
-      if (
-        arr[0] === 0x89 &&
-        arr[1] === 0x50 &&
-        arr[2] === 0x4e &&
-        arr[3] === 0x47 &&
-        arr[4] === 0x0d &&
-        arr[5] === 0x0a &&
-        arr[6] === 0x1a &&
-        arr[7] === 0x0a
-      ) {
-        resolve('PNG');
-        return;
-      }
-
-      // JPEG signature: FF D8
-      if (arr[0] === 0xff && arr[1] === 0xd8) {
-        resolve('JPEG');
-        return;
-      }
-
-      // GIF signature: 47 49 46
-      if (arr[0] === 0x47 && arr[1] === 0x49 && arr[2] === 0x46) {
-        resolve('GIF');
-        return;
-      }
-
-      // WebP signature: RIFF....WEBP
-      if (
-        arr[0] === 0x52 &&
-        arr[1] === 0x49 &&
-        arr[2] === 0x46 &&
-        arr[3] === 0x46 &&
-        arr[8] === 0x57 &&
-        arr[9] === 0x45 &&
-        arr[10] === 0x42 &&
-        arr[11] === 0x50
-      ) {
-        resolve('WEBP');
-        return;
-      }
-
-      // HEIC/HEIF signature: ftyp at offset 4
-      if (arr[4] === 0x66 && arr[5] === 0x74 && arr[6] === 0x79 && arr[7] === 0x70) {
-        const brand = String.fromCharCode(arr[8], arr[9], arr[10], arr[11]);
-        if (['heic', 'heix', 'hevc', 'hevx', 'mif1', 'msf1'].includes(brand)) {
-          resolve('HEIC');
-          return;
-        }
-      }
-
-      // Fallback to file extension
-      const ext = file.name.split('.').pop()?.toUpperCase();
-      resolve(ext || 'UNKNOWN');
-    };
+  // Binary magic numbers first - the common case
+  const binaryFormat = sniffImageFormat(head);
+  if (binaryFormat) {
+    return binaryFormat;
+  }
 
-    reader.onerror = () => reject(new Error('Failed to read file'));
+  // SVG: look for an <svg tag in the raw bytes (no text decoding)
+  const svgWindow = new Uint8Array(await file.slice(0, SVG_SNIFF_BYTES).arrayBuffer());
+  if (containsSvgTag(svgWindow)) {
+    return 'SVG';
+  }
 
-    // Read first 200 bytes for format detection (increased for SVG detection)
-    reader.readAsArrayBuffer(file.slice(0, 200));
-  });
+  // Fallback to file extension
+  const ext = file.name.split('.').pop()?.toUpperCase();
+  return ext || 'UNKNOWN';
 };
 
 /**
  * Check if image format is supported by canvas (browser)
  */
 export const isCanvasCompatible = (format: string): boolean => {
-  const compatible = ['PNG', 'JPEG', 'JPG', 'WEBP', 'GIF', 'SVG'];
-  return compatible.includes(format.toUpperCase());
+  return CANVAS_COMPATIBLE_FORMATS.has(format.toUpperCase());
 };
 
 /**
  * Check if image format needs conversion
  */
 export const needsConversion = (format: string): boolean => {
-  const formatUpper = format.toUpperCase();
-  return formatUpper === 'HEIC' || formatUpper === 'HEIF' || formatUpper === 'SVG';
+  return CONVERSION_REQUIRED_FORMATS.has(format.toUpperCase());
 };
 
 /**
@@ -170,11 +209,38 @@ export const fileToDataURL = (file: File): Promise<string> => {
   });
 };
 
+/**
+ * Split a data URL into its MIME type and base64 payload.
+ * Uses a single indexOf/slice so multi-megabyte payloads are not scanned
+ * by split() or a regex. Strings without a data: prefix are treated as
+ * bare base64 with an unknown MIME type.
+ */
+export const parseDataUrl = (dataUrl: string): { mimeType: string | null; base64: string } => {
+  if (!dataUrl.startsWith('data:')) {
+    return { mimeType: null, base64: dataUrl };
+  }
+
+  const commaIndex = dataUrl.indexOf(',');
+  if (commaIndex === -1) {
+    return { mimeType: null, base64: '' };
+  }
+
+  const header = dataUrl.slice(5, commaIndex);
+  const semicolonIndex = header.indexOf(';');
+  const mimeType = semicolonIndex === -1 ? header : header.slice(0, semicolonIndex);
+
+  return { mimeType: mimeType || null, base64: dataUrl.slice(commaIndex + 1) };
+};
+
 /**
  * Check if browser supports a specific image format
  */
 export const browserSupportsFormat = (format: string): boolean => {
   const formatUpper = format.toUpperCase();
+  const cached = browserFormatSupport.get(formatUpper);
+  if (cached !== undefined) {
+    return cached;
+  }
 
   // Create a test canvas
   const canvas = document.createElement('canvas');
@@ -182,11 +248,15 @@ export const browserSupportsFormat = (format: string): boolean => {
   canvas.height = 1;
 
   // Try to export in the specified format
+  let supported: boolean;
   try {
-    const mimeType = `image/${formatUpper.toLowerCase()}`;
+    const mimeType = FORMAT_MIME_TYPES[formatUpper] ?? `image/${formatUpper.toLowerCase()}`;
     const dataUrl = canvas.toDataURL(mimeType);
-    return dataUrl.indexOf(mimeType) !== -1;
+    supported = dataUrl.indexOf(mimeType) !== -1;
   } catch {
-    return false;
+    supported = false;
   }
+
+  browserFormatSupport.set(formatUpper, supported);
+  return supported;
 };